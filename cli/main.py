@@ -1,71 +1,155 @@
 # cli/main.py
 from __future__ import annotations
 import argparse
-import json
+import itertools
 import os
+import queue
 import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Any, Iterable
+from typing import Callable, Dict, List, Any, Iterable, Optional, Tuple
 
 # --- Ensure repo root is importable (so workers/core imports resolve) ---
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-# Project imports
-from workers.py.runner import analyze_file
-try:
-    from core.sarif import to_sarif  # optional: for --sarif-out
-    HAS_SARIF = True
-except Exception:
-    HAS_SARIF = False
+# Project imports: the analyzer, SARIF writer and JSON encoder are imported lazily,
+# on first use, so --help and human-format runs don't pay for what they skip.
+def _get_analyze_file() -> Callable[..., List[Dict[str, Any]]]:
+    from workers.py.runner import analyze_file
+    return analyze_file
+
+def _get_write_sarif_file() -> Optional[Callable[..., None]]:
+    """Return core.sarif.write_sarif_file, or None when SARIF support is unavailable."""
+    try:
+        from core.sarif import write_sarif_file  # optional: for --sarif-out
+    except Exception:
+        return None
+    return write_sarif_file
 
 # Directories to skip when scanning folders
-SKIP_DIRS = {
+# (frozen + interned: probed once per directory entry during the walk)
+SKIP_DIRS = frozenset(map(sys.intern, (
     ".git", ".venv", "venv", "__pycache__", "node_modules",
     "dist", "build", "site-packages", "vscode-extension",
     # exclude EdgeCheck engine code
     "cli", "core", "workers", "tests", "tools"
-}
+)))
 
-def iter_python_files(root: Path) -> Iterable[Path]:
-    """Yield all .py files under root, skipping SKIP_DIRS."""
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
-        for f in filenames:
-            if f.endswith(".py"):
-                yield Path(dirpath) / f
+def _scan(path: str) -> Iterable[str]:
+    """Recursive os.scandir walk; prunes SKIP_DIRS before descending."""
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                if e.name in SKIP_DIRS:
+                    continue
+                yield from _scan(e.path)
+            elif e.name.endswith(".py"):
+                yield e.path
+
+def iter_python_files(root: Path) -> Iterable[str]:
+    """Yield paths (as str) of all .py files under root, skipping SKIP_DIRS."""
+    yield from _scan(os.fspath(root))
+
+def _analyze_one(task: Tuple[str, int, int, int, Optional[int]]) -> List[Dict[str, Any]]:
+    """Analyze a single file; module-level so it can run in a worker process."""
+    path, budget_ms, max_trials, max_findings, fn_jobs = task
+    return _get_analyze_file()(path, budget_ms, max_trials, max_findings, jobs=fn_jobs) or []
 
 def analyze_many(
-    files: Iterable[Path],
+    files: Iterable[str],
     budget_ms: int,
     max_trials: int,
-    max_findings: int
+    max_findings: int,
+    jobs: int = 1,
+    on_file: Optional[Callable[[List[Dict[str, Any]]], None]] = None
 ) -> List[Dict[str, Any]]:
-    """Run analyzer over many files and concatenate findings."""
+    """
+    Run analyzer over many files and concatenate findings (in input order).
+    Files are analyzed in a process pool when jobs > 1; a single file spreads
+    its functions over 'jobs' workers instead. jobs=1 stays serial.
+    'on_file' receives each file's findings as soon as every earlier file is
+    done, so consumers see input order without waiting for the whole run.
+    """
+    files = list(files)
+    pooled = jobs > 1 and len(files) > 1
+    # Pooled: parallelism is across files, so each file runs its functions on one
+    # worker; otherwise analyze_file spreads functions over up to 'jobs' workers.
+    fn_jobs = 1 if pooled else max(1, jobs)
+    tasks = [(p, budget_ms, max_trials, max_findings, fn_jobs) for p in files]
+    per_file: List[Optional[List[Dict[str, Any]]]] = [None] * len(tasks)
+    next_out = 0
+
+    def done(i: int, fnds: List[Dict[str, Any]]) -> None:
+        nonlocal next_out
+        per_file[i] = fnds
+        while next_out < len(per_file) and per_file[next_out] is not None:
+            if on_file is not None:
+                on_file(per_file[next_out])
+            next_out += 1
+
+    if not pooled:
+        for i, task in enumerate(tasks):
+            try:
+                fnds = _analyze_one(task)
+            except Exception as e:
+                sys.stderr.write(f"[edgecheck] error analyzing {files[i]}: {e}\n")
+                fnds = []
+            done(i, fnds)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as ex:
+            futures = {ex.submit(_analyze_one, task): i for i, task in enumerate(tasks)}
+            for fut in as_completed(futures):
+                i = futures[fut]
+                try:
+                    fnds = fut.result()
+                except Exception as e:
+                    sys.stderr.write(f"[edgecheck] error analyzing {files[i]}: {e}\n")
+                    fnds = []
+                done(i, fnds)
+
     all_findings: List[Dict[str, Any]] = []
-    for p in files:
-        try:
-            fnds = analyze_file(str(p), budget_ms, max_trials, max_findings) or []
-            all_findings.extend(fnds)
-        except Exception as e:
-            sys.stderr.write(f"[edgecheck] error analyzing {p}: {e}\n")
+    for fnds in per_file:
+        all_findings.extend(fnds or [])
     return all_findings
 
+def _sarif_writer(
+    q: "queue.Queue",
+    write_sarif_file: Callable[..., None],
+    out_path: str,
+    errors: List[BaseException]
+) -> None:
+    """Writer-thread body: stream per-file finding batches from q into SARIF until None."""
+    def drain() -> Iterable[Dict[str, Any]]:
+        while True:
+            batch = q.get()
+            if batch is None:
+                return
+            yield from batch
+    try:
+        write_sarif_file(drain(), out_path)
+    except Exception as e:
+        errors.append(e)
+
 def print_human(findings: List[Dict[str, Any]]) -> None:
     """Pretty, human-readable summary."""
     if not findings:
         print("✅ No findings.")
         return
 
-    # per-file grouping
-    by_file: Dict[str, List[Dict[str, Any]]] = {}
-    for f in findings:
-        by_file.setdefault(f.get("file", "<unknown>"), []).append(f)
+    # per-file grouping: stable sort by file, then groupby (keeps per-file order)
+    def file_of(f: Dict[str, Any]) -> str:
+        return f.get("file", "<unknown>")
 
     total = len(findings)
     print(f"⚠️  Findings: {total}")
-    for file, items in sorted(by_file.items()):
+    for file, items in itertools.groupby(sorted(findings, key=file_of), key=file_of):
         print(f"{file}")
         for it in items:
             line = it.get("line", 1)
@@ -91,38 +175,18 @@ def build_argparser() -> argparse.ArgumentParser:
                     help="Max input trials per function.")
     ap.add_argument("--max-findings", type=int, default=50,
                     help="Max findings reported per file.")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="Files analyzed in parallel; for a single file, its functions (1 = serial).")
     ap.add_argument("--format", choices=["human", "json"], default="human",
                     help="Output format.")
     ap.add_argument("--sarif-out", default=None,
                     help="Optional: write SARIF to this file (requires core.sarif).")
     return ap
 
-# -------- JSON sanitization so bytes/sets/tuples/etc. don't crash dumps --------
-def _jsonable(x: Any) -> Any:
-    """Convert non-JSON-serializable objects into safe representations."""
-    if x is None or isinstance(x, (bool, int, float, str)):
-        return x
-    if isinstance(x, bytes):
-        # show a short safe string like "b''" or b'\x00...'
-        try:
-            s = x.decode('utf-8', errors='replace')
-            return f"b'{s}'"
-        except Exception:
-            return f"b<{len(x)} bytes>"
-    if isinstance(x, (list, tuple, set)):
-        return [_jsonable(i) for i in x]
-    if isinstance(x, dict):
-        return {str(k): _jsonable(v) for k, v in x.items()}
-    # Exceptions, Path, etc.
-    if isinstance(x, Exception):
-        return f"{x.__class__.__name__}: {x}"
-    if isinstance(x, Path):
-        return str(x)
-    # Fallback: stringified
-    return str(x)
-
-def _json_dump(obj: Any) -> str:
-    return json.dumps(_jsonable(obj), indent=2)
+# -------- JSON output (core.jsonio handles bytes/sets/Path/etc.) --------
+def _emit_json(obj: Any) -> None:
+    from core.jsonio import dumps, write_stdout
+    write_stdout(dumps(obj))
 
 # -----------------------------------------------------------------------------
 
@@ -140,27 +204,44 @@ def main() -> None:
         if not files:
             print("✅ No Python files found to analyze.")
             if args.format == "json":
-                print(_json_dump({"version": "0.1.0", "findings": []}))
+                _emit_json({"version": "0.1.0", "findings": []})
             return
         print(f"[edgecheck] scanning {len(files)} Python files under {target}")
-        findings = analyze_many(files, args.budget_ms, args.max_trials, args.max_findings)
+        jobs = args.jobs
     else:
         if target.suffix != ".py":
             ap.error(f"Expected a .py file or a directory, got: {target}")
-        findings = analyze_many([target], args.budget_ms, args.max_trials, args.max_findings)
+        files, jobs = [args.path], args.jobs
 
-    # SARIF (optional)
+    # SARIF (optional): encoded on a writer thread while analysis is still running
+    sarif_q: Optional["queue.Queue"] = None
+    sarif_errors: List[BaseException] = []
+    writer: Optional[threading.Thread] = None
     if args.sarif_out:
-        if not HAS_SARIF:
+        write_sarif_file = _get_write_sarif_file()
+        if write_sarif_file is None:
             sys.stderr.write("[edgecheck] SARIF not available (core.sarif missing).\n")
         else:
-            sarif = to_sarif(findings)
-            Path(args.sarif_out).write_text(_json_dump(sarif))
+            sarif_q = queue.Queue()
+            writer = threading.Thread(target=_sarif_writer,
+                                      args=(sarif_q, write_sarif_file, args.sarif_out, sarif_errors),
+                                      name="edgecheck-sarif", daemon=True)
+            writer.start()
+
+    findings = analyze_many(files, args.budget_ms, args.max_trials, args.max_findings, jobs,
+                            on_file=sarif_q.put if sarif_q is not None else None)
+
+    if writer is not None:
+        sarif_q.put(None)
+        writer.join()
+        if sarif_errors:
+            sys.stderr.write(f"[edgecheck] failed to write SARIF: {sarif_errors[0]}\n")
+        else:
             print(f"[edgecheck] wrote SARIF: {Path(args.sarif_out).resolve()}")
 
     # Output
     if args.format == "json":
-        print(_json_dump({"version": "0.1.0", "findings": findings}))
+        _emit_json({"version": "0.1.0", "findings": findings})
     else:
         print_human(findings)
 
@@ -1,6 +1,12 @@
 # core/codes.py
+import sys
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+try:
+    import ahocorasick  # optional: pyahocorasick, for guard message matching
+except ImportError:
+    ahocorasick = None
 
 @dataclass
 class Code:
@@ -19,22 +25,44 @@ class Code:
 EC102 = Code("EC102", "Guarded invalid input (buffer size)", "info",
              "This ValueError is an intentional guard. Consider documenting or validating earlier.")
 
+# generic ValueError (if message doesn’t match a known guard) -> treat as warning
+EC090 = Code("EC090", "ValueError", "warning", "Review arguments and add guards.")
+
+# Exception class name -> code (keys interned; probed once per crash)
+CODEMAP: Dict[str, Code] = {sys.intern(k): v for k, v in (
+    ("ZeroDivisionError", EC001),
+    ("IndexError", EC002),
+    ("ValueError", EC090),
+)}
+
+# (lowercase message substring, code) for ValueErrors raised as intentional guards
+GUARD_VALUEERROR_RULES: Tuple[Tuple[str, Code], ...] = (
+    ("denominator cannot be zero", EC101),
+    ("buffer too small for index", EC102),
+)
+
 def lookup_for_exception_name(exc_name: str) -> Optional[Code]:
-    exc = (exc_name or "").split(".")[-1]
-    if exc == "ZeroDivisionError":
-        return EC001
-    if exc == "IndexError":
-        return EC002
-    if exc == "ValueError":
-        # generic ValueError (if message doesn’t match a known guard) -> treat as warning
-        return Code("EC090", "ValueError", "warning", "Review arguments and add guards.")
-    return None
+    return CODEMAP.get((exc_name or "").rpartition(".")[2])
+
+def _build_guard_automaton():
+    """Aho-Corasick automaton over the guard needles (None without pyahocorasick)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for i, (needle, ec) in enumerate(GUARD_VALUEERROR_RULES):
+        automaton.add_word(needle, (i, ec))
+    automaton.make_automaton()
+    return automaton
+
+_GUARD_AUTOMATON = _build_guard_automaton()
 
 def lookup_valueerror_by_message(msg: str) -> Optional[Code]:
     m = (msg or "").lower()
-    if "denominator cannot be zero" in m:
-        return EC101
-    if "buffer too small for index" in m:
-        return EC102
+    if _GUARD_AUTOMATON is not None:
+        # single pass over the message; earliest rule in the table wins, as below
+        hits = [hit for _end, hit in _GUARD_AUTOMATON.iter(m)]
+        return min(hits, key=lambda h: h[0])[1] if hits else None
+    for needle, ec in GUARD_VALUEERROR_RULES:
+        if needle in m:
+            return ec
     return None
-
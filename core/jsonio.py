@@ -0,0 +1,49 @@
+# core/jsonio.py
+import json
+import sys
+from typing import Any
+
+try:
+    import orjson  # optional: much faster encoder, emits bytes directly
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def json_default(o: Any) -> Any:
+    """Fallback for values the encoder can't handle (bytes, sets, Path, exceptions, ...)."""
+    if isinstance(o, (bytes, bytearray)):
+        return repr(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if isinstance(o, BaseException):
+        return f"{o.__class__.__name__}: {o}"
+    # Path, and anything else: stringified
+    return str(o)
+
+class SafeEncoder(json.JSONEncoder):
+    """json.JSONEncoder that calls back into json_default instead of raising."""
+    def default(self, o: Any) -> Any:
+        return json_default(o)
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize obj as indented UTF-8 JSON bytes in a single pass.
+    Uses orjson when installed; both encoders handle dicts/lists/primitives
+    natively and only call back for exotic types.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, cls=SafeEncoder, indent=2).encode("utf-8")
+
+def write_stdout(data: bytes) -> None:
+    """
+    Write already-encoded JSON (plus newline) to stdout in one call on the
+    binary buffer, skipping a decode + print round trip.
+    """
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:  # stdout replaced by a text-only stream (e.g. in tests)
+        print(data.decode("utf-8"))
+        return
+    sys.stdout.flush()  # keep ordering with earlier print() output
+    out.write(data + b"\n")
+    out.flush()
@@ -1,48 +1,91 @@
 # edgecheck: ignore-file
 # edgecheck: ignore-file
-import json, os
-from typing import List, Dict
+import io
+import os
+from typing import BinaryIO, Dict, Iterable, List
 
-def to_sarif(findings: List[Dict]) -> str:
-    rules = {}
-    results = []
-    for f in findings or []:
-        rule_id = f.get("code", "EC999")
-        if rule_id not in rules:
-            rules[rule_id] = {
-                "id": rule_id,
-                "name": f.get("title", rule_id),
-                "shortDescription": {"text": f.get("title", rule_id)},
-                "fullDescription": {"text": f.get("hint", "")},
-                "help": {"text": f.get("hint", "")},
-                "properties": {"tags": ["edgecheck"]}
-            }
-        level = {
-            "error": "error",
-            "warning": "warning",
-            "info": "note"
-        }.get(str(f.get("severity", "warning")).lower(), "warning")
-        results.append({
-            "ruleId": rule_id,
-            "level": level,
-            "message": {"text": f.get("message","")},
-            "locations": [{
-                "physicalLocation": {
-                    "artifactLocation": {"uri": "file://" + os.path.abspath(f.get("file",""))},
-                    "region": {
-                        "startLine": f.get("line", 1),
-                        "startColumn": (f.get("start_col") or 1) + 1,
-                        "endColumn": (f.get("end_col") or 120) + 1
-                    }
+from core.jsonio import dumps
+
+_LEVEL = {"error": "error", "warning": "warning", "info": "note"}
+_TAGS = ["edgecheck"]
+
+def _rule(f: Dict, rule_id: str) -> Dict:
+    get = f.get
+    title = get("title", rule_id)
+    hint = get("hint", "")
+    return {
+        "id": rule_id,
+        "name": title,
+        "shortDescription": {"text": title},
+        "fullDescription": {"text": hint},
+        "help": {"text": hint},
+        "properties": {"tags": _TAGS}
+    }
+
+def _result(f: Dict, rule_id: str, uris: Dict[str, str]) -> Dict:
+    get = f.get
+    raw = get("file", "")
+    uri = uris.get(raw)  # findings cluster by file: resolve each path once
+    if uri is None:
+        uri = uris[raw] = "file://" + os.path.abspath(raw)
+    return {
+        "ruleId": rule_id,
+        "level": _LEVEL.get(str(get("severity", "warning")).lower(), "warning"),
+        "message": {"text": get("message", "")},
+        "locations": [{
+            "physicalLocation": {
+                "artifactLocation": {"uri": uri},
+                "region": {
+                    "startLine": get("line", 1),
+                    "startColumn": (get("start_col") or 1) + 1,
+                    "endColumn": (get("end_col") or 120) + 1
                 }
-            }]
-        })
-    sarif = {
-        "version": "2.1.0",
-        "$schema": "https://schemastore.azurewebsites.net/schemas/json/sarif-2.1.0.json",
-        "runs": [{
-            "tool": {"driver": {"name": "EdgeCheck", "rules": list(rules.values())}},
-            "results": results
+            }
         }]
     }
-    return json.dumps(sarif, indent=2)
+
+_PRELUDE = (
+    b'{\n'
+    b'  "version": "2.1.0",\n'
+    b'  "$schema": "https://schemastore.azurewebsites.net/schemas/json/sarif-2.1.0.json",\n'
+    b'  "runs": [\n'
+    b'    {\n'
+    b'      "results": ['
+)
+_INDENT = b"\n        "
+
+def write_sarif(findings: Iterable[Dict], fp: BinaryIO) -> None:
+    """
+    Stream a SARIF document to the binary file object 'fp' in one pass.
+    Results are encoded and written one at a time (peak memory is a single
+    result); rules are small and are collected on the way, then written after
+    the results array (key order is irrelevant to SARIF consumers).
+    """
+    rules: Dict[str, Dict] = {}
+    uris: Dict[str, str] = {}
+    fp.write(_PRELUDE)
+    sep = _INDENT
+    for f in findings or ():
+        rule_id = f.get("code", "EC999")
+        if rule_id not in rules:
+            rules[rule_id] = _rule(f, rule_id)
+        fp.write(sep + dumps(_result(f, rule_id, uris)).replace(b"\n", _INDENT))
+        sep = b"," + _INDENT
+    fp.write(b"\n      ],\n      \"tool\": ")
+    tool = {"driver": {"name": "EdgeCheck", "rules": list(rules.values())}}
+    fp.write(dumps(tool).replace(b"\n", b"\n      "))
+    fp.write(b"\n    }\n  ]\n}\n")
+
+# Large buffer: per-result writes coalesce into a few big write() syscalls
+SARIF_BUFFER_SIZE = 1 << 20
+
+def write_sarif_file(findings: Iterable[Dict], path: str) -> None:
+    """Stream findings as SARIF straight into the file at 'path' (binary, no text encode step)."""
+    with open(path, "wb", buffering=SARIF_BUFFER_SIZE) as fp:
+        write_sarif(findings, fp)
+
+def to_sarif(findings: List[Dict]) -> bytes:
+    """Encode findings as a SARIF document (in-memory wrapper over write_sarif)."""
+    buf = io.BytesIO()
+    write_sarif(findings, buf)
+    return buf.getvalue()
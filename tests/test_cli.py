@@ -0,0 +1,67 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# tools/ is a script directory, not a package
+_spec = importlib.util.spec_from_file_location("sarif_batch", ROOT / "tools" / "sarif_batch.py")
+sarif_batch = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sarif_batch)
+
+def _touch(root: Path, *rels: str) -> None:
+    for rel in rels:
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("x = 1\n")
+
+def test_edgecheckignore_prunes_dirs_and_matches_globs(tmp_path, monkeypatch):
+    _touch(tmp_path, "keep.py", "pkg/mod.py", "pkg/gen/skip_me.py",
+           "vendor/lib.py", "build_out/a.py", "pkg/test_mod.py")
+    (tmp_path / ".edgecheckignore").write_text(textwrap.dedent("""
+        # comments and blank lines are ignored
+
+        vendor/
+        build_*/
+        pkg/gen/*
+        */test_*.py
+    """))
+    dir_excludes, dir_re, path_re = sarif_batch.load_excludes(tmp_path)
+    assert dir_excludes == {"vendor"}
+    assert dir_re.match("build_out") and not path_re.match("build_out")
+    assert path_re.match("pkg/test_mod.py") and not path_re.match("keep.py")
+
+    opened = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(sarif_batch.os, "scandir", lambda p: opened.append(p) or real_scandir(p))
+    found = sorted(os.path.relpath(p, tmp_path).replace(os.sep, "/")
+                   for p in sarif_batch.iter_python_files(tmp_path))
+    assert found == ["keep.py", "pkg/mod.py"]
+    # excluded directories are pruned during the walk, never listed
+    listed = {os.path.relpath(p, tmp_path).replace(os.sep, "/") for p in opened}
+    assert not listed & {"vendor", "build_out"}
+
+def _sarif_results(tmp_path: Path, jobs: int):
+    out = tmp_path / f"out{jobs}.sarif"
+    subprocess.run(
+        [sys.executable, str(ROOT / "cli" / "main.py"), str(tmp_path / "src"),
+         "--budget-ms", "100", "--jobs", str(jobs), "--sarif-out", str(out)],
+        check=True, capture_output=True, cwd=str(ROOT),
+    )
+    return json.loads(out.read_text())["runs"][0]["results"]
+
+def test_parallel_sarif_keeps_input_order(tmp_path):
+    for i in range(4):
+        p = tmp_path / "src" / f"m{i}.py"
+        p.parent.mkdir(exist_ok=True)
+        p.write_text(f"def div{i}(a: int, b: int):\n    return a / b\n\n"
+                     f"def at{i}(b: bytes):\n    return memoryview(b)[100]\n")
+    serial = _sarif_results(tmp_path, 1)
+    assert len(serial) == 8
+    assert _sarif_results(tmp_path, 2) == serial
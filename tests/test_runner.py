@@ -0,0 +1,214 @@
+import os
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from workers.py.runner import analyze_file
+
+TARGET = textwrap.dedent('''
+    import sys
+
+    def divide(a: int, b: int):
+        return a / b
+
+    def bad_bytes(b: bytes):
+        return b[100]
+
+    def guarded(b: int):
+        if b == 0:
+            raise ValueError("denominator cannot be zero")
+        return 1 / b
+
+    def spin(x: int):
+        while True:
+            pass
+
+    def bails(x: int):
+        sys.exit(3)
+
+    def fine(s: str):
+        return s.upper()
+
+    def _private(x):
+        return 1 / 0
+''')
+
+def _by_function(tmp_path, src=TARGET, **kw):
+    p = tmp_path / "target.py"
+    p.write_text(src)
+    return {f["function"]: f for f in analyze_file(str(p), **kw)}
+
+def test_crashes_are_mapped_to_codes_and_spans(tmp_path):
+    found = _by_function(tmp_path)
+    assert set(found) == {"divide", "bad_bytes", "guarded", "spin", "bails"}
+
+    div = found["divide"]
+    assert (div["code"], div["line"], div["kind"]) == ("EC001", 5, "Crash")
+    assert (div["start_col"], div["end_col"]) == (11, 16)
+    assert div["param_names"] == ["a", "b"]
+    assert div["repro"]["args"][1] == 0
+
+    assert found["bad_bytes"]["code"] == "EC002"
+    assert found["guarded"]["code"] == "EC101"
+
+def test_timeouts_and_dead_workers_do_not_stop_the_file(tmp_path):
+    found = _by_function(tmp_path, budget_ms=100)
+    assert found["spin"]["kind"] == "Timeout"
+    assert found["bails"]["message"].startswith("RuntimeError")
+    # functions after a killed worker still get analyzed
+    assert found["divide"]["code"] == "EC001"
+
+def test_ignore_pragma(tmp_path):
+    assert _by_function(tmp_path, "# edgecheck: ignore-file\n" + TARGET) == {}
+
+def test_parallel_workers_match_serial(tmp_path):
+    p = tmp_path / "target.py"
+    p.write_text(TARGET)
+    key = lambda fs: [(f["function"], f["code"], f["line"], f["repro"]["args"]) for f in fs]
+    serial = analyze_file(str(p), budget_ms=100, jobs=1)
+    assert key(analyze_file(str(p), budget_ms=100, jobs=3)) == key(serial)
+    assert key(analyze_file(str(p), budget_ms=100, max_findings_per_file=2, jobs=3)) == key(serial[:2])
+
+def test_inprocess_fast_path_matches_isolated_workers(tmp_path):
+    key = lambda found: {n: (f["code"], f["line"], f["repro"]["args"]) for n, f in found.items()}
+    fast = _by_function(tmp_path, budget_ms=100)
+    isolated = _by_function(tmp_path, "# edgecheck: isolate\n" + TARGET, budget_ms=100)
+    # the pragma line shifts every line number by one
+    assert {n: (c, ln + 1, a) for n, (c, ln, a) in key(fast).items()} == key(isolated)
+
+def test_fast_path_escalates_base_exceptions_to_a_worker(tmp_path):
+    src = textwrap.dedent('''
+        def stop(x: int):
+            raise KeyboardInterrupt
+
+        def divide(a: int, b: int):
+            return a / b
+    ''')
+    # must not escape analyze_file and take the other findings with it
+    found = _by_function(tmp_path, src, budget_ms=100)
+    assert found["stop"]["message"].startswith("RuntimeError")
+    assert found["divide"]["code"] == "EC001"
+
+def test_kwargs_only_def_still_gets_trials(tmp_path):
+    # it looks trivially safe, but positional candidates can't bind to **kw
+    found = _by_function(tmp_path, "def opts(**kw):\n    pass\n")
+    assert found["opts"]["message"].startswith("TypeError")
+
+def test_warm_workers_are_reused_until_the_file_changes(tmp_path):
+    from workers.py import runner
+    p = tmp_path / "target.py"
+    # memoryview() keeps it off the in-process fast path
+    p.write_text("def bad_bytes(b: bytes):\n    return memoryview(b)[100]\n")
+    analyze_file(str(p), jobs=1)
+    (key, parked), = [(k, v) for k, v in runner._IDLE_SESSIONS.items() if k[0] == str(p)]
+    worker = parked[0]
+    runner._TRIAL_CACHE.clear()
+    assert analyze_file(str(p), jobs=1)[0]["code"] == "EC002"
+    assert runner._IDLE_SESSIONS[key] == [worker]
+
+    os.utime(p, ns=(key[1] + 10**9, key[1] + 10**9))
+    analyze_file(str(p), jobs=1)
+    assert key not in runner._IDLE_SESSIONS and not worker.alive()
+
+def test_pairwise_trials_reach_late_parameter_values(tmp_path):
+    from workers.py import runner
+    src = textwrap.dedent('''
+        def late_pair(a: int, b: int, c: int, d: str):
+            if c == -2 and d == "x" * 256:
+                raise ValueError("late pair")
+    ''')
+    # the riskiest combo plus one covering array: every value pair gets tried
+    rows = len(runner._pairwise_indices((5, 5, 5, 5)))
+    found = _by_function(tmp_path, src, max_trials_per_fn=rows + 1)
+    assert found["late_pair"]["repro"]["args"][2:] == [-2, "x" * 256]
+
+def test_union_candidates_cover_every_member(tmp_path):
+    src = textwrap.dedent('''
+        from typing import Union
+
+        def bump(x: Union[int, str]):
+            return x + 1
+    ''')
+    found = _by_function(tmp_path, src)
+    assert found["bump"]["message"].startswith("TypeError")
+    assert isinstance(found["bump"]["repro"]["args"][0], str)
+
+def test_worker_survives_its_own_timeouts(tmp_path):
+    from workers.py import runner
+    p = tmp_path / "target.py"
+    p.write_text("def spin(x: int):\n    while True:\n        pass\n")
+    assert analyze_file(str(p), budget_ms=50, jobs=1)[0]["kind"] == "Timeout"
+    (worker,), = [v for k, v in runner._IDLE_SESSIONS.items() if k[0] == str(p)]
+    assert worker.alive()
+
+def test_fast_path_restores_the_hosts_alarm(tmp_path):
+    import signal
+    handler = lambda signum, frame: None
+    prev = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, 30.0)
+    try:
+        assert _by_function(tmp_path)["divide"]["code"] == "EC001"
+        assert signal.getsignal(signal.SIGALRM) is handler
+        assert 0 < signal.getitimer(signal.ITIMER_REAL)[0] <= 30.0
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, prev)
+
+def test_each_trial_sees_the_module_as_imported(tmp_path):
+    src = textwrap.dedent('''
+        SEEN = []
+
+        def add(x: int):
+            SEEN.append(x)
+            return [x][len(SEEN) - 1]  # fails only once SEEN holds a stale entry
+    ''')
+    # state left by one trial (or by an earlier run) must not leak into the next
+    assert _by_function(tmp_path, src, jobs=1) == {}
+    assert _by_function(tmp_path, src, jobs=1) == {}
+
+def test_hang_in_c_code_is_cut_off_at_its_own_trial(tmp_path):
+    import time
+    src = textwrap.dedent('''
+        def stuck(x: int, y: int):
+            if x == 2:
+                sum(range(10**12))  # no bytecode boundary for SIGALRM to land on
+    ''')
+    t0 = time.monotonic()
+    found = _by_function(tmp_path, src, budget_ms=100, jobs=1)
+    assert found["stuck"]["kind"] == "Timeout"
+    assert found["stuck"]["repro"]["args"][0] == 2
+    assert time.monotonic() - t0 < 2.0
+
+def test_defs_under_module_level_blocks_are_analyzed(tmp_path):
+    src = textwrap.dedent('''
+        import sys
+
+        if sys.version_info >= (3,):
+            def inv(x: int):
+                return 1 / x
+        try:
+            import not_a_real_module
+        except ImportError:
+            def fallback(b: bytes):
+                return memoryview(b)[100]
+    ''')
+    found = _by_function(tmp_path, src)
+    assert (found["inv"]["code"], found["fallback"]["code"]) == ("EC001", "EC002")
+
+def test_findings_point_at_the_branch_that_defined_the_function(tmp_path):
+    src = textwrap.dedent('''
+        import sys
+
+        if sys.maxsize > 0:
+            def pick(b: bytes):
+                return memoryview(b)[100]
+        else:
+            def pick(b: bytes):
+                return 1 / len(b)
+    ''')
+    found = _by_function(tmp_path, src)["pick"]
+    assert (found["code"], found["line"], found["start_col"]) == ("EC002", 6, 15)
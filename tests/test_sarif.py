@@ -0,0 +1,35 @@
+import io
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.sarif import to_sarif, write_sarif
+
+FINDINGS = [
+    {"file": "a.py", "line": 3, "start_col": 4, "end_col": 9, "code": "EC001",
+     "title": "Possible division by zero", "severity": "error", "message": "ZeroDivisionError: division by zero",
+     "hint": "Check denominator or early-return."},
+    {"file": "a.py", "line": 7, "code": "EC001", "title": "Possible division by zero", "severity": "error"},
+    {"file": "b.py", "line": 1, "code": "EC101", "severity": "info", "message": "ValueError: guard"},
+]
+
+def test_write_sarif_streams_valid_document():
+    buf = io.BytesIO()
+    write_sarif(iter(FINDINGS), buf)  # single pass: a generator is enough
+    doc = json.loads(buf.getvalue())
+    run = doc["runs"][0]
+    assert doc["version"] == "2.1.0"
+    assert [r["id"] for r in run["tool"]["driver"]["rules"]] == ["EC001", "EC101"]
+    assert [r["level"] for r in run["results"]] == ["error", "error", "note"]
+    region = run["results"][0]["locations"][0]["physicalLocation"]["region"]
+    assert region == {"startLine": 3, "startColumn": 5, "endColumn": 10}
+    assert run["results"][2]["locations"][0]["physicalLocation"]["artifactLocation"]["uri"].endswith("/b.py")
+
+def test_to_sarif_empty():
+    doc = json.loads(to_sarif([]))
+    assert doc["runs"][0]["results"] == []
+    assert doc["runs"][0]["tool"]["driver"]["rules"] == []
@@ -1,5 +1,5 @@
 # tools/sarif_batch.py
-import argparse, json, os, sys
+import argparse, fnmatch, os, re, sys
 from pathlib import Path
 
 # --- Ensure repo root is on sys.path so 'workers', 'core', 'cli' import ---
@@ -7,22 +7,85 @@
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from workers.py.runner import analyze_file  # now resolvable after sys.path tweak
-from core.sarif import to_sarif
+from cli.main import analyze_many  # now resolvable after sys.path tweak
+from core.sarif import write_sarif_file
 
-SKIP_DIRS = {
+SKIP_DIRS = frozenset(map(sys.intern, (
     '.git', '.venv', 'venv', '__pycache__', 'node_modules',
     'dist', 'build', 'site-packages', 'vscode-extension',
     # exclude EdgeCheck engine code from scans
     'cli', 'core', 'workers', 'tests', 'tools'
-}
+)))
+
+IGNORE_FILE = '.edgecheckignore'
+
+def _compile_globs(patterns):
+    """Fold glob patterns into one regex (None when empty) so each path is a single probe."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{fnmatch.translate(p)})' for p in patterns))
+
+def load_excludes(root: Path):
+    """
+    Parse .edgecheckignore into (dir_excludes, dir_re, path_re).
+    'name/' entries prune that root-relative directory; every other entry is
+    a glob tested against root-relative POSIX paths.
+    """
+    dir_excludes, dir_globs, path_globs = set(), [], []
+    p = root / IGNORE_FILE
+    if p.is_file():
+        for ln in p.read_text(encoding='utf-8').splitlines():
+            pat = ln.strip()
+            if not pat or pat.startswith('#'):
+                continue
+            if pat.endswith('/'):
+                pat = pat.rstrip('/')
+                if any(c in pat for c in '*?['):
+                    dir_globs.append(pat)
+                else:
+                    dir_excludes.add(pat)
+            else:
+                path_globs.append(pat)
+    return frozenset(dir_excludes), _compile_globs(dir_globs + path_globs), _compile_globs(path_globs)
+
+def _scan(path: str, root_len: int, excludes):
+    dir_excludes, dir_re, path_re = excludes
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                if e.name in SKIP_DIRS:
+                    continue
+                rel = e.path[root_len:].replace(os.sep, '/')
+                if rel in dir_excludes or (dir_re is not None and dir_re.match(rel)):
+                    continue
+                yield from _scan(e.path, root_len, excludes)
+            elif e.name.endswith('.py'):
+                if path_re is not None and path_re.match(e.path[root_len:].replace(os.sep, '/')):
+                    continue
+                yield e.path
+
+IGNORE_PRAGMA = b'# edgecheck: ignore-file'
+
+def has_ignore_pragma(path) -> bool:
+    """
+    Cheap pre-filter for the '# edgecheck: ignore-file' pragma: inspect the
+    first 5 lines of a small head read instead of reading the whole file.
+    """
+    try:
+        with open(path, 'rb') as fh:
+            head = fh.read(512)
+    except OSError:
+        return False
+    return any(ln.strip().lower() == IGNORE_PRAGMA for ln in head.splitlines()[:5])
 
 def iter_python_files(root: Path):
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
-        for f in filenames:
-            if f.endswith('.py'):
-                yield Path(dirpath) / f
+    """Yield .py files under root, pruning SKIP_DIRS and .edgecheckignore excludes."""
+    base = os.fspath(root)
+    yield from _scan(base, len(os.path.join(base, '')), load_excludes(root))
 
 def main():
     ap = argparse.ArgumentParser()
@@ -30,24 +93,17 @@ def main():
     ap.add_argument('--budget-ms', type=int, default=200)
     ap.add_argument('--max-trials', type=int, default=24)
     ap.add_argument('--max-findings', type=int, default=50)
+    ap.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
     args = ap.parse_args()
 
     root = ROOT
-    targets = list(iter_python_files(root))
+    targets = [p for p in iter_python_files(root) if not has_ignore_pragma(p)]
     print(f"[edgecheck] scanning {len(targets)} Python files from {root}")
 
-    all_findings = []
-    for p in targets:
-        try:
-            findings = analyze_file(str(p), args.budget_ms, args.max_trials, args.max_findings)
-            if findings:
-                all_findings.extend(findings)
-        except Exception as e:
-            sys.stderr.write(f"[edgecheck] error on {p}: {e}\n")
+    all_findings = analyze_many(targets, args.budget_ms, args.max_trials, args.max_findings, args.jobs)
 
-    sarif = to_sarif(all_findings)
     out_path = Path(args.out)
-    out_path.write_text(json.dumps(sarif, indent=2))
+    write_sarif_file(all_findings, str(out_path))
     print(f"[edgecheck] wrote SARIF: {out_path.resolve()}")
 
 if __name__ == '__main__':
@@ -2,23 +2,32 @@
 from __future__ import annotations
 
 import ast
+import builtins
+import collections
+import copy
 import importlib.util
 import inspect
-import time
-import json
-import contextlib
-import io
-import sys
 import itertools
+import time
 import multiprocessing as mp
+import multiprocessing.util as mp_util
+from multiprocessing.connection import wait as _wait_conns
 import os
 import traceback
+import weakref
 import math
 import fnmatch
+import functools
 import random
-from typing import Any, Dict, List, Tuple, Optional, get_origin, get_args
-from typing import get_origin, get_args, Any, Optional, Union
-from multiprocessing import Process, Pipe
+import re
+import select
+import signal
+import struct
+import sys
+import threading
+import types
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin
 from core.codes import lookup_for_exception_name, lookup_valueerror_by_message
 
 # --------------------------------------------------------------------
@@ -48,10 +57,10 @@ def edgecheck_ignore(func):
     """Decorator: mark a function to be ignored by EdgeCheck."""
     setattr(func, "__edgecheck_ignore__", True)
     return func
-try:
-    MPCTX = mp.get_context("fork")
-except ValueError:
-    MPCTX = mp.get_context()
+# Fork on Linux: workers inherit the target module the parent already imported
+# (copy-on-write) instead of booting an interpreter and re-executing it. Other
+# platforms keep their default (spawn on macOS/Windows; fork is unsafe there).
+MPCTX = mp.get_context("fork") if sys.platform.startswith("linux") else mp.get_context()
 # --------------------------------------------------------------------
 # Module loading
 # --------------------------------------------------------------------
@@ -64,10 +73,38 @@ def load_module_from_path(path: str):
     spec.loader.exec_module(mod)  # type: ignore[attr-defined]
     return mod
 
+# --------------------------------------------------------------------
+# Source / AST / code caches, keyed by (abspath, st_mtime_ns)
+# --------------------------------------------------------------------
+def _source_key(path: str) -> Tuple[str, int]:
+    """Cache key for 'path': an edit bumps st_mtime_ns and invalidates every cache below."""
+    ap = os.path.abspath(path)
+    return ap, os.stat(ap).st_mtime_ns
+
+@functools.lru_cache(maxsize=256)
+def _head_lines(path: str, mtime_ns: int, n: int = 5) -> Tuple[str, ...]:
+    """First n lines (stripped, lowercased) for pragma checks, without reading the rest."""
+    with open(path, "rb") as f:
+        return tuple(f.readline().decode("utf-8", "ignore").strip().lower() for _ in range(n))
+
+@functools.lru_cache(maxsize=256)
+def _read_src(path: str, mtime_ns: int) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+@functools.lru_cache(maxsize=256)
+def _parse_tree(path: str, mtime_ns: int) -> ast.Module:
+    return ast.parse(_read_src(path, mtime_ns), filename=path)
+
+@functools.lru_cache(maxsize=256)
+def _compile_code(path: str, mtime_ns: int):
+    """Module code object, compiled from the cached AST (no re-read, no re-parse)."""
+    return compile(_parse_tree(path, mtime_ns), path, "exec")
+
 # --------------------------------------------------------------------
 # Candidate value generation
 # --------------------------------------------------------------------
-FALLBACK_VALUES: List[Any] = [
+FALLBACK_VALUES: Tuple[Any, ...] = (
     0, 1, -1,
     0.0, 1.0, -1.0,
     "", "x",
@@ -76,129 +113,572 @@ def load_module_from_path(path: str):
     (), (0,), (1,),
     {}, {"k": 0},
     True, False, None,
-]
+)
 
-def _values_for_annotation(ann: Any) -> List[Any]:
-    """Return small, diverse candidate sets based on type annotations. Never raise."""
+def _same_value(a: Any, b: Any) -> bool:
+    """Identity, or equality within the same type (0, 0.0, False and -0.0 all differ)."""
+    if a is b:
+        return True
+    if type(a) is not type(b) or a != b:
+        return False
+    return type(a) is not float or math.copysign(1.0, a) == math.copysign(1.0, b)
+
+def _dedupe_values(vals) -> List[Any]:
+    """Order-preserving dedupe for tiny candidate pools; no repr() of big values, unhashables fine."""
+    out: List[Any] = []
+    for v in vals:
+        if not any(_same_value(x, v) for x in out):
+            out.append(v)
+    return out
+
+def _some_bytes_of_len(n: int) -> bytes:
+    return bytes([i % 256 for i in range(n)])
+
+# Per-annotation candidates, built once at import and shared (read-only)
+_INT_VALS: Tuple[Any, ...] = (0, 1, -1, 2, -2, 10**9, -10**9)
+_FLOAT_VALS: Tuple[Any, ...] = (0.0, -0.0, 1.0, -1.0, 1e308, -1e308, float('inf'), float('-inf'), float('nan'))
+_BOOL_VALS: Tuple[Any, ...] = (False, True)
+_STR_VALS: Tuple[Any, ...] = ("", "a", "0", "-1", "x" * 256, "ñö🦄")
+_BYTES_VALS: Tuple[Any, ...] = (b"", b"\x00", _some_bytes_of_len(50), _some_bytes_of_len(100), _some_bytes_of_len(101))
+_LIST_VALS: Tuple[Any, ...] = ([], [0], [1, 2, 3])
+_TUPLE_VALS: Tuple[Any, ...] = ((), (0,), (1, 2))
+_DICT_VALS: Tuple[Any, ...] = ({}, {"k": "v"}, {0: 1})
+_ANY_VALS: Tuple[Any, ...] = (None, 0, 1, "", "x", b"", _some_bytes_of_len(100))
+
+# Plain (non-generic) annotations → their candidate tuple
+BASIC_EDGE_VALUES: Dict[Any, Tuple[Any, ...]] = {
+    int: _INT_VALS,
+    float: _FLOAT_VALS,
+    bool: _BOOL_VALS,
+    str: _STR_VALS,
+    bytes: _BYTES_VALS,
+    bytearray: _BYTES_VALS,
+    list: _LIST_VALS,
+    tuple: _TUPLE_VALS,
+    dict: _DICT_VALS,
+    Any: _ANY_VALS,
+    type(None): (None,),
+    None: (None,),
+}
+
+_NO_VALUE = object()  # zip_longest padding
+_UNION_ORIGINS = (Union, getattr(types, "UnionType", Union))  # types.UnionType: 'int | str', 3.10+
+
+# Candidates actually tried per parameter (first few only)
+MAX_VALS_PER_PARAM = 5
+
+def _values_for_annotation(ann) -> Tuple[Any, ...]:
+    """Return candidate values for a type annotation (memoized; treat as read-only)."""
     try:
-        origin = get_origin(ann)
-        args = get_args(ann) if origin else ()
-
-        # typing containers
-        if origin is list:
-            return [[], [0], ["x"]]
-        if origin is tuple:
-            return [(), (0,), ("x",)]
-        if origin is dict:
-            return [{}, {"k": 0}]
-        if origin is set:
-            return [set(), {0}]
-
-        # Optional[T] == Union[T, NoneType]
-        if origin is Optional or (origin is getattr(__import__("typing"), "Union") and type(None) in args):
-            inner = [a for a in args if a is not type(None)]
-            pool: List[Any] = [None]
-            for a in inner or [Any]:
-                pool.extend(_values_for_annotation(a)[:2])
-            # dedupe
-            seen, out = set(), []
-            for v in pool:
-                k = repr(v)
-                if k in seen:
-                    continue
-                seen.add(k)
-                out.append(v)
-            return out[:5]
-
-        # Plain classes
-        if ann in (int,):
-            return [0, 1, -1]
-        if ann in (float,):
-            return [0.0, 1.0, -1.0]
-        if ann in (str,):
-            return ["", "x"]
-        if ann in (bytes,):
-            return [b"", b"\x00", bytes(range(101))]
-        if ann in (bool,):
-            return [False, True]
-        if ann in (list,):
-            return [[], [0]]
-        if ann in (tuple,):
-            return [(), (0,)]
-        if ann in (dict,):
-            return [{}, {"k": 0}]
-    except Exception:
-        pass
-    return FALLBACK_VALUES
+        vals = BASIC_EDGE_VALUES.get(ann)  # plain types: no typing introspection at all
+        if vals is not None:
+            return vals
+        return _cached_values_for_annotation(ann)
+    except TypeError:  # unhashable annotation object → compute uncached
+        return _annotation_candidates(ann)
+
+@functools.lru_cache(maxsize=512)
+def _cached_values_for_annotation(ann) -> Tuple[Any, ...]:
+    return _annotation_candidates(ann)
+
+def _param_candidates(ann) -> Tuple[Any, ...]:
+    """One parameter's trial values: sliced, fallback applied, risky first (memoized; read-only)."""
+    try:
+        return _cached_param_candidates(ann)
+    except TypeError:
+        return _build_param_candidates(ann)
+
+@functools.lru_cache(maxsize=512)
+def _cached_param_candidates(ann) -> Tuple[Any, ...]:
+    return _build_param_candidates(ann)
+
+def _build_param_candidates(ann) -> Tuple[Any, ...]:
+    vals = _values_for_annotation(ann) if ann is not inspect.Parameter.empty else FALLBACK_VALUES
+    return tuple(_risky_first(vals[:MAX_VALS_PER_PARAM] if vals else FALLBACK_VALUES[:MAX_VALS_PER_PARAM]))
+
+def _annotation_candidates(ann) -> Tuple[Any, ...]:
+    origin = get_origin(ann)
+    args = get_args(ann)
+
+    # Union[A, B, ...] / A | B: members' candidates interleaved (so the first few
+    # cover every member), None first if Optional
+    if origin in _UNION_ORIGINS:
+        members = [a for a in args if a is not type(None)]
+        head = (None,) if len(members) < len(args) else ()
+        rows = itertools.zip_longest(*map(_values_for_annotation, members), fillvalue=_NO_VALUE)
+        mixed = (v for v in itertools.chain.from_iterable(rows) if v is not _NO_VALUE)
+        return tuple(_dedupe_values(itertools.chain(head, mixed)))
+
+    # Unknown/other annotation (plain types never get here) → fall back
+    return ()
 
 # --------------------------------------------------------------------
-# Subprocess runner with timeout
+# Persistent worker: one long-lived subprocess per target file
 # --------------------------------------------------------------------
-def _runner(target_path: str, fn_name: str, args, kwargs, conn):
-    """
-    Run a single function from target_path in a clean globals dict so no symbols
-    (like 'path') leak into the module namespace.
-    """
+# Target modules already imported by the parent, by abspath. Workers forked while
+# an entry exists inherit the module and reuse it instead of re-executing it.
+_PRELOADED: Dict[str, Any] = {}
+
+# Parent ends of every worker's two pipes. A forked worker closes its inherited
+# copies first thing, so a sibling still sees EOF once the parent goes away.
+_PARENT_CONNS: "weakref.WeakSet" = weakref.WeakSet()
+
+def _exec_target(target_path: str):
+    """Exec the target in a FRESH globals dict -> (globals, load_error or None)."""
+    g: Dict[str, Any] = {}
     try:
-        # Read source
-        with open(target_path, "r", encoding="utf-8") as f:
-            src = f.read()
+        # Compiled code (cached per path+mtime)
+        code = _compile_code(*_source_key(target_path))
 
-        # Compile and exec in a FRESH globals dict
+        # Exec in a FRESH globals dict
         g = {
             "__name__": "__edgecheck_target__",
             "__file__": target_path,
             "__package__": None,
             "__builtins__": __builtins__,
         }
-        code = compile(src, target_path, "exec")
         exec(code, g, g)  # module-level code runs here, isolated
+    except Exception as e:
+        return g, _failure(e)
+
+    return g, None
+
+# Worker → parent result frame: ">BIII" header (ok, index of the trial in its
+# batch, len(msg), len(stack)) followed by the two UTF-8 blobs. Fixed shape,
+# so no pickle on the hot path. A header alone with ok=_STARTED is a progress
+# frame: trial 'index' of the batch is about to run.
+_RESULT_HEADER = struct.Struct(">BIII")
+
+def _pack_result(ok: bool, msg: str, stack: str, index: int = 0) -> bytes:
+    m = msg.encode("utf-8", "surrogatepass")
+    st = stack.encode("utf-8", "surrogatepass")
+    return _RESULT_HEADER.pack(ok, index, len(m), len(st)) + m + st
+
+_STARTED = 2
+
+def _started_frame(index: int) -> bytes:
+    return _RESULT_HEADER.pack(_STARTED, index, 0, 0)
+
+def _unpack_result(frame: bytes) -> Tuple[int, Tuple[bool, str, str]]:
+    ok, index, n_msg, n_stack = _RESULT_HEADER.unpack_from(frame)
+    off = _RESULT_HEADER.size
+    msg = frame[off:off + n_msg].decode("utf-8", "surrogatepass")
+    stack = frame[off + n_msg:off + n_msg + n_stack].decode("utf-8", "surrogatepass")
+    return index, (bool(ok), msg, stack)
+
+# Failure stacks travel as raw frame positions, not formatted tracebacks: the
+# worker reads no source lines, and the parent formats only the stacks that
+# end up in findings (_format_stack). Layout: _FRAMES_MARK, one row per frame
+# (filename, lineno, end_lineno, colno, end_colno, name joined by _FIELD_SEP)
+# separated by newlines, _FRAMES_MARK, then the format_exception_only text.
+# Chained exceptions keep the full format_exc() text instead.
+_FRAMES_MARK = "\x00"
+_FIELD_SEP = "\x1f"
+
+def _failure(e: BaseException) -> Tuple[bool, str, str]:
+    """(ok=False, msg, stack) for an exception being handled; call from its except block."""
+    msg = f"{e.__class__.__name__}: {e}"
+    if e.__cause__ is not None or (e.__context__ is not None and not e.__suppress_context__):
+        return False, msg, traceback.format_exc()
+    te = traceback.TracebackException(type(e), e, e.__traceback__, lookup_lines=False)
+    rows = "\n".join(
+        _FIELD_SEP.join((
+            f.filename,
+            "" if f.lineno is None else str(f.lineno),
+            "" if f.end_lineno is None else str(f.end_lineno),
+            "" if f.colno is None else str(f.colno),
+            "" if f.end_colno is None else str(f.end_colno),
+            f.name,
+        ))
+        for f in te.stack
+    )
+    exc_only = "".join(te.format_exception_only())
+    return False, msg, _FRAMES_MARK + rows + _FRAMES_MARK + exc_only
+
+_TIMED_OUT: Tuple[bool, str, str] = (False, "TimeoutError: budget exceeded", "")
+_NO_RESULT: Tuple[bool, str, str] = (False, "RuntimeError: no result from child", "")
+_OK: Tuple[bool, str, str] = (True, "", "")
+_OK_FRAME = _pack_result(*_OK)
+
+# In-process trials are budgeted with ITIMER_REAL/SIGALRM where available (POSIX).
+_HAS_ITIMER = hasattr(signal, "setitimer")
+
+# A warm worker is only a template: each trial runs in a child forked from it,
+# so every trial sees the module exactly as imported (no state left over from
+# earlier trials or earlier analyze_file calls), and the worker itself kills a
+# child that overruns its budget, even inside C code. Like MPCTX this is Linux
+# only: elsewhere (fork is unsafe on macOS) the worker runs the trial itself and
+# the parent retires it after a single trial. The parent only kills a worker
+# that misses a trial's budget by more than _WORKER_GRACE_S.
+_FORK_TRIALS = sys.platform.startswith("linux") and hasattr(os, "fork")
+_WORKER_GRACE_S = 0.25
+
+class _BudgetExceeded(BaseException):
+    """Raised by the SIGALRM handler; BaseException so target code can't catch it."""
+
+def _raise_budget_exceeded(signum, frame):
+    raise _BudgetExceeded()
+
+def _read_all(fd: int, deadline: float) -> Optional[bytes]:
+    """Everything written to 'fd' until EOF, or None if 'deadline' passes first."""
+    chunks: List[bytes] = []
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            return None
+        chunk = os.read(fd, 1 << 16)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+def _forked_trial(fn: Any, args: List[Any], budget_ms: int, inherited: Tuple[Any, ...]) -> Tuple[bool, str, str]:
+    """
+    Run fn(*args) in a child forked from this (template) worker and return its
+    (ok, msg, stack): _TIMED_OUT if it overruns 'budget_ms' (it is killed),
+    _NO_RESULT if it exits without a reply (sys.exit, os._exit, a crash).
+    """
+    deadline = time.monotonic() + budget_ms / 1000.0
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(r)
+            for c in inherited:
+                c.close()  # a hung child must not keep the parent's pipes open
+            try:
+                fn(*args)
+                frame = _OK_FRAME
+            except Exception as e:
+                frame = _pack_result(*_failure(e))
+            view = memoryview(frame)
+            while view:
+                view = view[os.write(w, view):]
+        finally:
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except Exception:
+                    pass
+            os._exit(0)
+    os.close(w)
+    try:
+        data = _read_all(r, deadline)
+    finally:
+        os.close(r)
+    if data is None:
+        os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+    if data is None:
+        return _TIMED_OUT
+    return _unpack_result(data)[1] if data else _NO_RESULT
+
+def _session_main(target_path: str, requests, conn) -> None:
+    """
+    Worker-process loop. Get the target module ONCE (inherited from the parent
+    under fork, else exec'd via _exec_target), then serve (fn_name, batch,
+    budget_ms) messages from 'requests' until None/EOF, replying on 'conn'. Each
+    batch is a list of positional argument lists run in order, each trial in
+    its own forked child under its own budget (_forked_trial); the reply is one
+    result frame: the first failure (with its index) or OK for the lot,
+    preceded by a _started_frame per trial so the parent can time each one.
+    """
+    sys.dont_write_bytecode = True  # no .pyc writes from anything the target imports
+
+    for inherited in list(_PARENT_CONNS):
+        inherited.close()
+    _PARENT_CONNS.clear()
+
+    load_error = None
+    preloaded = _PRELOADED.get(target_path)
+    if preloaded is not None:
+        # Forked from the parent after it imported the target: the module is
+        # already here (copy-on-write), so skip compile + exec entirely.
+        g = preloaded.__dict__
+    else:
+        g, load_error = _exec_target(target_path)
+
+    while True:
+        try:
+            req = requests.recv()
+        except EOFError:
+            return
+        if req is None:
+            return
+        fn_name, batch, budget_ms = req
+        if load_error is not None:
+            conn.send_bytes(_pack_result(*load_error))
+            continue
 
         # Look up the function
         if fn_name not in g or not callable(g[fn_name]):
-            conn.send((
+            conn.send_bytes(_pack_result(
                 False,
                 f"AttributeError: function {fn_name} not found in {target_path}",
                 ""
             ))
+            continue
+
+        # Call it, once per trial, stopping at the first failure
+        fn = g[fn_name]
+        frame = _OK_FRAME
+        for current, args in enumerate(batch):
+            conn.send_bytes(_started_frame(current))
+            if _FORK_TRIALS:
+                res = _forked_trial(fn, args, budget_ms, (requests, conn))
+            else:
+                try:
+                    fn(*args)
+                    res = _OK
+                except Exception as e:
+                    res = _failure(e)
+            if not res[0]:
+                frame = _pack_result(*res, index=current)
+                break
+        conn.send_bytes(frame)
+
+class _ForkedProcess:
+    """
+    The part of multiprocessing.Process that WorkerSession uses (start,
+    is_alive, join, terminate, kill), on a bare os.fork(): no Popen, sentinel
+    pipe or bootstrap bookkeeping per worker. Used when the start method is
+    fork anyway; like multiprocessing, the child gets /dev/null for stdin and
+    flushes stdio before exiting.
+    """
+    __slots__ = ("_target", "_args", "pid", "exitcode")
+
+    def __init__(self, target, args: Tuple[Any, ...]):
+        self._target = target
+        self._args = args
+        self.pid: Optional[int] = None
+        self.exitcode: Optional[int] = None
+
+    def start(self) -> None:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()  # don't let the child re-emit buffered parent output
+            except Exception:
+                pass
+        pid = os.fork()
+        if pid:
+            self.pid = pid
             return
+        code = 1
+        try:
+            try:
+                sys.stdin.close()
+                sys.stdin = open(os.devnull)
+            except (OSError, ValueError):
+                pass
+            self._target(*self._args)
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except Exception:
+                    pass
+            os._exit(code)
 
-        # Call it
-        g[fn_name](*args, **kwargs)
+    def is_alive(self) -> bool:
+        if self.exitcode is None and self.pid is not None:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+            except ChildProcessError:
+                self.exitcode = -1
+                return False
+            if pid:
+                self.exitcode = os.waitstatus_to_exitcode(status)
+        return self.exitcode is None
 
-        # Success
-        conn.send((True, "", ""))
-    except Exception as e:
-        tb = traceback.format_exc()
-        conn.send((False, f"{e.__class__.__name__}: {e}", tb))
-
-def _call_with_timeout(target_path, fn_name, args, kwargs, budget_ms):
-    parent_conn, child_conn = Pipe(duplex=False)
-    p = Process(target=_runner, args=(os.path.abspath(target_path), fn_name, args, kwargs, child_conn))
-    p.start()
-    child_conn.close()
-    p.join(timeout=budget_ms / 1000.0)
-
-    if p.is_alive():
-        p.terminate()
-        p.join(0.1)
-        return False, "TimeoutError: budget exceeded", ""
-
-    if parent_conn.poll():
-        ok, msg, tb = parent_conn.recv()
-    else:
-        ok, msg, tb = False, "RuntimeError: no result from child", ""
-    parent_conn.close()
-    return ok, msg, tb
+    def join(self, timeout: Optional[float] = None) -> None:
+        end = None if timeout is None else time.monotonic() + timeout
+        while self.is_alive():
+            if end is not None and time.monotonic() >= end:
+                return
+            time.sleep(0.001)
+
+    def _signal(self, signum: int) -> None:
+        if self.is_alive():
+            try:
+                os.kill(self.pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self) -> None:
+        self._signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self._signal(signal.SIGKILL)
+
+# Bare os.fork() workers where fork is the start method; multiprocessing otherwise.
+_RAW_FORK = MPCTX.get_start_method() == "fork" and hasattr(os, "fork")
+
+class WorkerSession:
+    """
+    A long-lived worker process for one target file: the module is executed
+    once, then each function's trials go over a one-way Pipe as one (fn_name,
+    batch, budget_ms) message instead of a fresh process + module exec per
+    trial; the reply is a single raw result frame on a second one-way Pipe,
+    not a pickle (plus a tiny progress frame as each trial starts). Trials run
+    in children forked from the worker, which times them out itself; the
+    parent only kills a worker that overruns a trial's budget plus grace or
+    dies. Either way it is respawned lazily.
+    """
+
+    def __init__(self, target_path: str):
+        self.target_path = os.path.abspath(target_path)
+        self._proc = None
+        self._req = None   # parent → worker: requests
+        self._conn = None  # worker → parent: result frames
+
+    def start(self) -> None:
+        """Start the worker now instead of on the first trial (no-op if running)."""
+        if self._proc is not None:
+            return
+        # two simplex pipes: plain os.pipe() fds, cheaper than a duplex socketpair
+        req_r, req_w = MPCTX.Pipe(duplex=False)
+        res_r, res_w = MPCTX.Pipe(duplex=False)
+        _PARENT_CONNS.add(req_w)
+        _PARENT_CONNS.add(res_r)
+        args = (self.target_path, req_r, res_w)
+        proc = _ForkedProcess(_session_main, args) if _RAW_FORK else MPCTX.Process(target=_session_main, args=args)
+        proc.start()
+        req_r.close()
+        res_w.close()
+        self._proc, self._req, self._conn = proc, req_w, res_r
+
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.is_alive()
+
+    def _kill(self) -> None:
+        proc, req, conn = self._proc, self._req, self._conn
+        self._proc = self._req = self._conn = None
+        if proc is None:
+            return
+        proc.terminate()
+        proc.join(0.1)
+        if proc.is_alive():
+            proc.kill()
+            proc.join(0.1)
+        req.close()
+        conn.close()
+
+    @property
+    def conn(self):
+        """Parent's result end while a worker is running (for connection.wait)."""
+        return self._conn
+
+    def submit(self, fn_name: str, batch, budget_ms: int) -> bool:
+        """Send a batch of trials (argument lists) without waiting; False if the worker is already gone."""
+        if self._proc is None:
+            self.start()
+        try:
+            self._req.send((fn_name, batch, budget_ms))
+            return True
+        except OSError:
+            self._kill()
+            return False
+
+    def result(self) -> Tuple[int, Optional[Tuple[bool, str, str]]]:
+        """
+        Receive the next frame for the last submit() as (index, result); call
+        once the conn is readable. result None: trial 'index' just started.
+        Otherwise index is the failing trial's position in the batch, or -1 if
+        the worker died without replying (the last started trial killed it).
+        """
+        try:
+            frame = self._conn.recv_bytes()
+        except (EOFError, OSError):
+            # worker died mid-trial (e.g. sys.exit / os._exit in the target)
+            self._kill()
+            return -1, _NO_RESULT
+        if frame[0] == _STARTED:
+            return _RESULT_HEADER.unpack_from(frame)[1], None
+        reply = _unpack_result(frame)
+        if not _FORK_TRIALS:
+            self.close()  # it ran the trial itself: its module state is spent
+        return reply
+
+    def abort(self) -> Tuple[bool, str, str]:
+        """The running trial went past its budget (plus grace): kill the worker, report a timeout."""
+        self._kill()
+        return _TIMED_OUT
+
+    def close(self) -> None:
+        """Ask the worker to exit, escalating to terminate/kill if it doesn't."""
+        proc, req, conn = self._proc, self._req, self._conn
+        if proc is None:
+            return
+        try:
+            req.send(None)
+        except OSError:
+            pass
+        proc.join(0.5)
+        if proc.is_alive():
+            self._kill()
+            return
+        self._proc = self._req = self._conn = None
+        req.close()
+        conn.close()
+
+# Warm sessions parked between analyze_file calls, by the (abspath, mtime_ns) of
+# the target they serve, least recently used first. Re-analyzing an unchanged
+# file reuses them; an edit (new mtime) retires them. Closed from a
+# multiprocessing finalizer, which also runs in pool worker processes (where
+# atexit does not) before they join their non-daemon children.
+_IDLE_SESSIONS: "collections.OrderedDict[Tuple[str, int], List[WorkerSession]]" = collections.OrderedDict()
+_IDLE_MAX = max(2, os.cpu_count() or 1)
+
+def _checkout_sessions(key: Tuple[str, int], n: int) -> List[WorkerSession]:
+    """n sessions for the target at 'key': parked warm ones first, then fresh (lazy) ones."""
+    for stale in [k for k in _IDLE_SESSIONS if k[0] == key[0] and k != key]:
+        for session in _IDLE_SESSIONS.pop(stale):
+            session.close()
+    parked = _IDLE_SESSIONS.get(key, [])
+    out: List[WorkerSession] = []
+    while parked and len(out) < n:
+        session = parked.pop()
+        if session.alive():
+            out.append(session)
+        else:
+            session.close()
+    if not parked:
+        _IDLE_SESSIONS.pop(key, None)
+    out += [WorkerSession(key[0]) for _ in range(n - len(out))]
+    return out
 
+def _checkin_sessions(key: Tuple[str, int], sessions: List[WorkerSession]) -> None:
+    """Park the still-running (idle) sessions; evict the least recently used past _IDLE_MAX."""
+    warm = [s for s in sessions if s.alive()]
+    for session in sessions:
+        if not session.alive():
+            session.close()
+    if warm:
+        _IDLE_SESSIONS.setdefault(key, []).extend(warm)
+        _IDLE_SESSIONS.move_to_end(key)
+    total = sum(len(v) for v in _IDLE_SESSIONS.values())
+    while total > _IDLE_MAX:
+        oldest_key, oldest = next(iter(_IDLE_SESSIONS.items()))
+        oldest.pop(0).close()
+        if not oldest:
+            del _IDLE_SESSIONS[oldest_key]
+        total -= 1
 
+def _close_idle_sessions() -> None:
+    while _IDLE_SESSIONS:
+        _key, parked = _IDLE_SESSIONS.popitem()
+        for session in parked:
+            session.close()
+
+mp_util.Finalize(None, _close_idle_sessions, exitpriority=10)
 
 # --------------------------------------------------------------------
 # AST utilities for precise ranges
 # --------------------------------------------------------------------
-def _function_nodes_by_name(tree: ast.AST) -> Dict[str, ast.FunctionDef]:
-    return {n.name: n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)}
-
 def _node_span(node: ast.AST) -> Tuple[Optional[int], Optional[int], Optional[int]]:
     """Safely extract (lineno, col, end_col) from a node; tolerate missing end_col_offset."""
     ln = getattr(node, "lineno", None)
@@ -208,28 +688,114 @@ def _node_span(node: ast.AST) -> Tuple[Optional[int], Optional[int], Optional[in
         ec = sc + 1  # best-effort width
     return ln, sc, ec
 
-def _risky_spans(fn_node: ast.FunctionDef) -> List[Tuple[int, int, int, str]]:
+class _Collector(ast.NodeVisitor):
     """
-    Collect spans as (lineno, start_col, end_col, kind) for constructs likely to cause crashes:
+    One pass over the module collecting, per function name, every FunctionDef
+    (node_for picks the one a runtime function came from; fn_nodes is the
+    static guess: shallowest def wins, a later one at the same depth
+    overrides) and the risky spans inside each as
+    (lineno, start_col, end_col, kind), nested defs included:
       - 'div' for division (a / b)
       - 'subscript' for indexing/slicing (b[...])
     """
-    spans: List[Tuple[int, int, int, str]] = []
-    for node in ast.walk(fn_node):
-        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Div):
-            ln, sc, ec = _node_span(node)
-            if ln is not None and sc is not None and ec is not None:
-                spans.append((ln, sc, ec, "div"))
-        elif isinstance(node, ast.Subscript):
-            ln, sc, ec = _node_span(node)
-            if ln is not None and sc is not None and ec is not None:
-                spans.append((ln, sc, ec, "subscript"))
-    return spans
+
+    def __init__(self) -> None:
+        self.fn_nodes: Dict[str, ast.FunctionDef] = {}
+        self._defs: Dict[str, List[ast.FunctionDef]] = {}  # every def of each name
+        self._fn_depth: Dict[str, int] = {}
+        self._depth = 0
+        self._open: List[List[Tuple[int, int, int, str]]] = []  # spans of enclosing FunctionDefs
+        self._spans: Dict[int, List[Tuple[int, int, int, str]]] = {}
+        self.top_level: Tuple[str, ...] = ()
+
+    def node_for(self, name: str, fn: Any) -> Optional[ast.FunctionDef]:
+        """
+        The def that produced the runtime function 'fn', matched on its first
+        line (a def in an if/else branch that never ran is not it), else the
+        fn_nodes pick.
+        """
+        first = getattr(getattr(fn, "__code__", None), "co_firstlineno", None)
+        for n in self._defs.get(name, ()):
+            if first == n.lineno or any(first == d.lineno for d in n.decorator_list):
+                return n
+        return self.fn_nodes.get(name)
+
+    def spans_of(self, node: ast.FunctionDef) -> List[Tuple[int, int, int, str]]:
+        return self._spans[id(node)]
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._defs.setdefault(node.name, []).append(node)
+        if self._depth <= self._fn_depth.get(node.name, self._depth):
+            self.fn_nodes[node.name] = node
+            self._fn_depth[node.name] = self._depth
+        spans: List[Tuple[int, int, int, str]] = []
+        self._spans[id(node)] = spans
+        self._open.append(spans)
+        self._nested(node)
+        self._open.pop()
+
+    def _nested(self, node: ast.AST) -> None:
+        self._depth += 1
+        self.generic_visit(node)
+        self._depth -= 1
+
+    visit_AsyncFunctionDef = visit_ClassDef = _nested
+
+    def _add_span(self, node: ast.AST, kind: str) -> None:
+        if not self._open:
+            return
+        ln, sc, ec = _node_span(node)
+        if ln is not None and sc is not None and ec is not None:
+            for spans in self._open:
+                spans.append((ln, sc, ec, kind))
+
+    def visit_BinOp(self, node: ast.BinOp) -> None:
+        if isinstance(node.op, ast.Div):
+            self._add_span(node, "div")
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        self._add_span(node, "subscript")
+        self.generic_visit(node)
+
+def _module_level_defs(body: List[ast.stmt]):
+    """
+    FunctionDefs that run at module level, in source order: the module body's
+    own, plus those nested in module-level if/try/with/match blocks (never
+    inside a function or class body).
+    """
+    for n in body:
+        if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield n
+        elif isinstance(n, ast.If):
+            yield from _module_level_defs(n.body)
+            yield from _module_level_defs(n.orelse)
+        elif isinstance(n, (ast.Try, getattr(ast, "TryStar", ast.Try))):
+            yield from _module_level_defs(n.body)
+            for h in n.handlers:
+                yield from _module_level_defs(h.body)
+            yield from _module_level_defs(n.orelse)
+            yield from _module_level_defs(n.finalbody)
+        elif isinstance(n, (ast.With, ast.AsyncWith)):
+            yield from _module_level_defs(n.body)
+        elif isinstance(n, ast.Match):
+            for case in n.cases:
+                yield from _module_level_defs(case.body)
+
+@functools.lru_cache(maxsize=256)
+def _collect(path: str, mtime_ns: int) -> _Collector:
+    """The finished _Collector pass over the cached AST (shared; treat as read-only)."""
+    tree = _parse_tree(path, mtime_ns)
+    collector = _Collector()
+    collector.visit(tree)
+    # module-level def names in source order (later redefinitions keep the first slot)
+    collector.top_level = tuple(dict.fromkeys(n.name for n in _module_level_defs(tree.body)))
+    return collector
 
 def _best_span_for_exc(spans: List[Tuple[int,int,int,str]], line: int, exc_name: str) -> Tuple[int, int]:
     """Pick an AST span on 'line' that best matches the exception kind."""
     kind = None
-    exc = (exc_name or "").split(".")[-1]
+    exc = (exc_name or "").rpartition(".")[2]
     if exc == "ZeroDivisionError":
         kind = "div"
     elif exc == "IndexError":
@@ -248,6 +814,42 @@ def _best_span_for_exc(spans: List[Tuple[int,int,int,str]], line: int, exc_name:
     # Fallback: underline most of the line
     return (0, 120)
 
+def _decode_frames(stack: str) -> Tuple[List[traceback.FrameSummary], str]:
+    """Split a compact stack (see _failure) into FrameSummary objects + the exception text."""
+    rows, _, exc_only = stack[1:].partition(_FRAMES_MARK)
+    frames = []
+    for row in rows.split("\n") if rows else ():
+        filename, ln, end_ln, col, end_col, name = row.split(_FIELD_SEP)
+        frames.append(traceback.FrameSummary(
+            filename, int(ln) if ln else None, name, lookup_line=False,
+            end_lineno=int(end_ln) if end_ln else None,
+            colno=int(col) if col else None,
+            end_colno=int(end_col) if end_col else None,
+        ))
+    return frames, exc_only
+
+def _format_stack(stack: str) -> str:
+    """Render a compact stack as the usual traceback text; other stacks pass through."""
+    if not stack.startswith(_FRAMES_MARK):
+        return stack
+    frames, exc_only = _decode_frames(stack)
+    return "Traceback (most recent call last):\n" + "".join(traceback.StackSummary.from_list(frames).format()) + exc_only
+
+def _stack_line(stack: str, path: str, default_line: int) -> int:
+    """Line of the innermost frame in 'path', read straight from a compact stack."""
+    if not stack.startswith(_FRAMES_MARK):
+        return _extract_line_from_stack(stack, path, default_line)
+    target = os.path.abspath(path)
+    for f in reversed(_decode_frames(stack)[0]):
+        if f.lineno and os.path.abspath(f.filename) == target:
+            return f.lineno
+    return default_line
+
+@functools.lru_cache(maxsize=256)
+def _tb_line_re(path: str) -> re.Pattern[str]:
+    """Traceback frame-header regex for 'path' (abspath resolved once per path)."""
+    return re.compile(rf'File "{re.escape(os.path.abspath(path))}", line (\d+)')
+
 def _extract_line_from_stack(stack: str, path: str, default_line: int) -> int:
     """
     Try to get the most relevant line number from a Python traceback for the given file.
@@ -255,67 +857,397 @@ def _extract_line_from_stack(stack: str, path: str, default_line: int) -> int:
     """
     if not stack:
         return default_line
-    needle = os.path.abspath(path)
-    line_num = default_line
-    for ln in stack.splitlines():
-        ln = ln.strip()
-        if ln.startswith('File "') and needle in ln:
-            try:
-                parts = [p.strip() for p in ln.split(",")]
-                for p in parts:
-                    if p.startswith("line "):
-                        num = int(p.replace("line ", "").strip())
-                        if num > 0:
-                            line_num = num
-            except Exception:
-                pass
-    return line_num
+    nums = [n for n in map(int, _tb_line_re(path).findall(stack)) if n > 0]
+    return nums[-1] if nums else default_line
 
-def _some_bytes_of_len(n: int) -> bytes:
-    return bytes([i % 256 for i in range(n)])
+def _is_risky(v: Any) -> bool:
+    """None, zero, -1, NaN and empty sequences/mappings: the values most likely to crash."""
+    if v is None:
+        return True
+    if isinstance(v, bool):
+        return False
+    if isinstance(v, (int, float)):
+        return v == 0 or v == -1 or v != v
+    if isinstance(v, (str, bytes, bytearray, list, tuple, dict)):
+        return len(v) == 0
+    return False
 
-def _values_for_annotation(ann) -> list:
-    """Return candidate values for a type annotation."""
-    origin = get_origin(ann)
-    args = get_args(ann)
+def _risky_first(vals) -> List[Any]:
+    return sorted(vals, key=lambda v: not _is_risky(v))  # stable: keeps order within each group
+
+def _index_vectors(depth: int, sizes: List[int]):
+    """Index tuples into lists of the given sizes whose indices sum to 'depth'."""
+    if len(sizes) == 1:
+        if depth < sizes[0]:
+            yield (depth,)
+        return
+    for i in range(min(depth, sizes[0] - 1) + 1):
+        for rest in _index_vectors(depth - i, sizes[1:]):
+            yield (i,) + rest
+
+def _diagonal_product(candidates: List[Tuple[Any, ...]]):
+    """
+    Same combos as itertools.product(*candidates), ordered by total index depth:
+    every parameter's first (riskiest) values are paired early instead of the
+    last parameter being swept exhaustively before the first one moves.
+    """
+    if not candidates:
+        yield ()
+        return
+    sizes = [len(c) for c in candidates]
+    if 0 in sizes:
+        return
+    for depth in range(sum(sizes) - len(sizes) + 1):
+        for idx in _index_vectors(depth, sizes):
+            yield tuple(c[i] for c, i in zip(candidates, idx))
+
+@functools.lru_cache(maxsize=128)
+def _pairwise_indices(sizes: Tuple[int, ...]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    IPO-style all-pairs covering array over index vectors (len(sizes) >= 2):
+    every value index of every parameter meets every value index of every
+    other parameter in at least one row. Rows start from the first two
+    parameters' product in diagonal order; each further parameter is added
+    to existing rows greedily (ties go to the lower, riskier index), then
+    rows are appended for the pairs still uncovered, their free slots set to 0.
+    """
+    rows: List[List[Optional[int]]] = [
+        [a, b] for a, b in sorted(((a, b) for a in range(sizes[0]) for b in range(sizes[1])), key=sum)
+    ]
+    for p in range(2, len(sizes)):
+        uncovered = {(q, a, b) for q in range(p) for a in range(sizes[q]) for b in range(sizes[p])}
+        # horizontal growth: extend each row with the value covering the most new pairs
+        for r in rows:
+            best = max(range(sizes[p]), key=lambda v: (sum((q, r[q], v) in uncovered for q in range(p)), -v))
+            r.append(best)
+            uncovered.difference_update((q, r[q], best) for q in range(p))
+        # vertical growth: a new or partially free row per remaining pair
+        extra: List[List[Optional[int]]] = []
+        for q, a, b in sorted(uncovered):
+            for r in extra:
+                if r[p] == b and r[q] in (None, a):
+                    r[q] = a
+                    break
+            else:
+                r = [None] * p + [b]
+                r[q] = a
+                extra.append(r)
+        for r in extra:
+            rows.append([0 if v is None else v for v in r])
+    return tuple(tuple(r) for r in rows)
+
+def _budgeted_combos(candidates: List[Tuple[Any, ...]], max_trials: int, seed: str):
+    """
+    Combos to try within a budget of 'max_trials'. If the whole product fits,
+    that's _diagonal_product. Otherwise: the all-riskiest combo, then an
+    all-pairs covering array (_pairwise_indices), then any single-parameter
+    deviation from the riskiest combo not seen yet, then a uniform sample of
+    the rest of the index space, seeded by 'seed' (the function name) so runs
+    are reproducible. The product is never materialized: sampled flat indices
+    are decoded into per-parameter indices.
+    """
+    sizes = [len(c) for c in candidates]
+    total = math.prod(sizes)
+    if total <= max_trials:
+        yield from _diagonal_product(candidates)
+        return
+
+    def sampled():
+        for flat in random.Random(seed).sample(range(total), max_trials):
+            idx = []
+            for size in reversed(sizes):
+                flat, rem = divmod(flat, size)
+                idx.append(rem)
+            idx.reverse()
+            yield tuple(idx)
+
+    seen = set()
+    pairs = _pairwise_indices(tuple(sizes)) if len(sizes) >= 2 else ()
+    for key in (*_index_vectors(0, sizes), *pairs, *_index_vectors(1, sizes)):
+        if key not in seen:
+            seen.add(key)
+            yield tuple(c[i] for c, i in zip(candidates, key))
+    for key in sampled():
+        if key not in seen:
+            yield tuple(c[i] for c, i in zip(candidates, key))
+
+# Trial results by (abspath, mtime_ns, fn_name, budget_ms, repr(args)), LRU-capped.
+# Re-analyzing an unchanged file in the same process (e.g. a long-running editor
+# integration) replays them instead of re-running the trials. Timeouts and
+# dead workers are load-dependent, so they are never cached.
+_TRIAL_CACHE: collections.OrderedDict = collections.OrderedDict()
+_TRIAL_CACHE_MAX = 4096
+
+def _trial_cache_get(k: Tuple[str, int, str, int, str]) -> Optional[Tuple[bool, str, str]]:
+    res = _TRIAL_CACHE.get(k)
+    if res is not None:
+        _TRIAL_CACHE.move_to_end(k)
+    return res
+
+def _trial_cache_put(k: Tuple[str, int, str, int, str], res: Tuple[bool, str, str]) -> None:
+    if res == _TIMED_OUT or res == _NO_RESULT:
+        return
+    _TRIAL_CACHE[k] = res
+    _TRIAL_CACHE.move_to_end(k)
+    if len(_TRIAL_CACHE) > _TRIAL_CACHE_MAX:
+        _TRIAL_CACHE.popitem(last=False)
+
+class _FnTrials:
+    """
+    Trial state for one function: remaining combos, how many were taken, a
+    cached failure waiting on the batch before it ('pending'), and whether
+    trials go to the worker one at a time ('single': no os.fork for per-trial
+    children, so each worker serves one trial).
+    """
+    __slots__ = ("name", "param_names", "candidates", "max_trials", "combos", "tried", "pending", "single")
+
+    def __init__(self, name: str, param_names: List[str], candidates: List[Tuple[Any, ...]], max_trials: int):
+        self.name = name
+        self.param_names = param_names
+        self.candidates = candidates
+        self.max_trials = max_trials
+        self.single = not _FORK_TRIALS
+        self.restart()
+
+    def restart(self) -> None:
+        self.combos = _budgeted_combos(self.candidates, self.max_trials, self.name)
+        self.tried = 0
+        self.pending: Optional[Tuple[List[Any], Tuple[bool, str, str]]] = None
+
+@dataclass(slots=True)
+class Finding:
+    """
+    One failed trial, as analyze_file keeps it until returning. 'stack' stays
+    in its wire form (see _failure) and is only rendered by to_dict(), so
+    findings dropped by max_findings_per_file never get formatted.
+    """
+    file: str
+    function: str
+    param_names: List[str]
+    line: int
+    start_col: int
+    end_col: int
+    kind: str
+    code: str
+    title: str
+    severity: str
+    message: str
+    hint: str
+    args: List[Any]
+    stack: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file": self.file,
+            "function": self.function,
+            "param_names": self.param_names,
+            "line": self.line,
+            "start_col": self.start_col,
+            "end_col": self.end_col,
+            "kind": self.kind,
+            "code": self.code,
+            "title": self.title,
+            "severity": self.severity,
+            "message": self.message,
+            "hint": self.hint,
+            "repro": {"args": self.args, "kwargs": {}},
+            "stack": _format_stack(self.stack),
+        }
+
+def _make_finding(
+    path: str,
+    name: str,
+    param_names: List[str],
+    args: List[Any],
+    msg: str,
+    stack: str,
+    line_map: Dict[str, int],
+    fn_spans: Dict[str, List[Tuple[int, int, int, str]]],
+) -> Finding:
+    """Build the Finding for a failed trial of function 'name'."""
+    # Map exception → EC code
+    exc_name = "TimeoutError" if msg.startswith("TimeoutError") else (msg.split(":")[0] if ":" in msg else "Exception")
+    ec = lookup_for_exception_name(exc_name)
+    if exc_name == "ValueError":
+        guard_ec = lookup_valueerror_by_message(msg)
+        if guard_ec:
+            ec = guard_ec
+
+    # Determine the most relevant source line (prefer traceback line)
+    default_line = line_map.get(name, 1)
+    line = _stack_line(stack, path, default_line)
+
+    # AST-precise columns
+    spans = fn_spans.get(name, [])
+    start_col, end_col = _best_span_for_exc(spans, line, exc_name)
+
+    return Finding(
+        file=os.path.abspath(path),
+        function=name,
+        param_names=param_names,
+        line=line,
+        start_col=start_col,
+        end_col=end_col,
+        kind="Crash" if exc_name != "TimeoutError" else "Timeout",
+        code=(ec.id if ec else "EC999"),
+        title=(ec.title if ec else exc_name),
+        severity=(ec.default_severity if ec else "warning"),
+        message=msg,
+        hint=(ec.hint if ec else "Review function arguments and add guards."),
+        args=copy.deepcopy(args),  # its own copy: candidate objects are shared by later trials
+        stack=stack,
+    )
+
+# --------------------------------------------------------------------
+# In-process fast path for provably-safe functions
+# --------------------------------------------------------------------
+# Builtins a fast-path function may call: bounded work on small inputs, no I/O,
+# no output. (bytes/bytearray/range/print/open/format and friends are out: they
+# can allocate unboundedly from an int argument or have side effects.)
+_INPROCESS_CALLS = frozenset({
+    "abs", "all", "any", "bool", "callable", "chr", "dict", "divmod", "float",
+    "frozenset", "hash", "id", "int", "isinstance", "issubclass", "len", "list",
+    "max", "min", "ord", "repr", "reversed", "round", "set", "sorted", "str",
+    "sum", "tuple", "type",
+})
+# Module-level values a fast-path function may read (exact types only): immutable
+# scalars, plus tuples/frozensets of them. A global list/dict/set could be
+# aliased to a local and mutated in the parent, leaking into every worker.
+_PLAIN_DATA = (type(None), bool, int, float, complex, str, bytes)
+
+def _is_frozen_data(v: Any, depth: int = 0) -> bool:
+    if type(v) in _PLAIN_DATA:
+        return True
+    if type(v) in (tuple, frozenset) and depth < 4:
+        return all(_is_frozen_data(x, depth + 1) for x in v)
+    return False
+# Nodes that can loop, grow without bound, touch other scopes or escape the timer
+_INPROCESS_BANNED = (
+    ast.For, ast.AsyncFor, ast.While, ast.ListComp, ast.SetComp, ast.DictComp,
+    ast.GeneratorExp, ast.Lambda, ast.FunctionDef, ast.AsyncFunctionDef,
+    ast.ClassDef, ast.Import, ast.ImportFrom, ast.Global, ast.Nonlocal,
+    ast.Yield, ast.YieldFrom, ast.Await, ast.With, ast.AsyncWith,
+    ast.Pow, ast.Mult, ast.LShift,
+)
+
+def _is_builtin_exception(name: str) -> bool:
+    obj = getattr(builtins, name, None)
+    return isinstance(obj, type) and issubclass(obj, Exception)
+
+def _plain_def(fn: Any, node: Optional[ast.FunctionDef]) -> bool:
+    """True if 'fn' is exactly the undecorated def at 'node' (not a later rebinding)."""
+    if node is None or node.decorator_list or not inspect.isfunction(fn):
+        return False
+    code = getattr(fn, "__code__", None)
+    return code is not None and code.co_firstlineno == node.lineno
+
+def _inprocess_safe(fn: Any, node: Optional[ast.FunctionDef], module_globals: Dict[str, Any]) -> bool:
+    """
+    True if 'fn' can only do bounded, side-effect-free work on the candidate
+    inputs, judged from its AST: no loops, comprehensions, imports, nested
+    scopes or decorators; calls only to whitelisted builtins (or builtin
+    exception classes); item/attribute stores only into parameters (the
+    candidates are per-call copies); global reads only of immutable data.
+    Anything else runs in a worker as usual.
+    """
+    if not _plain_def(fn, node):
+        return False
+    code = fn.__code__
+    local_names = set(code.co_varnames) | set(code.co_cellvars) | set(code.co_freevars)
+    a = node.args
+    param_names = {p.arg for p in (*a.posonlyargs, *a.args, *a.kwonlyargs, a.vararg, a.kwarg) if p is not None}
+
+    def allowed_builtin(name: str, called: bool) -> bool:
+        if name in local_names or name in module_globals:
+            return False  # shadowed: not the builtin
+        if name in _INPROCESS_CALLS or _is_builtin_exception(name):
+            return True
+        return not called and name in ("NotImplemented", "Ellipsis")
+
+    # only the body runs per call (annotations and defaults were evaluated at def time)
+    for n in (n for stmt in node.body for n in ast.walk(stmt)):
+        if isinstance(n, _INPROCESS_BANNED):
+            return False
+        if isinstance(n, ast.ExceptHandler):
+            # a bare/BaseException handler could swallow the budget timer
+            if n.type is None or (isinstance(n.type, ast.Name) and n.type.id == "BaseException"):
+                return False
+        elif isinstance(n, ast.FormattedValue) and n.format_spec is not None:
+            return False  # width/precision from the input → unbounded strings
+        elif isinstance(n, ast.BinOp) and isinstance(n.op, ast.Mod) and isinstance(n.left, (ast.Constant, ast.JoinedStr)):
+            return False  # printf-style formatting
+        elif isinstance(n, ast.Call):
+            if not (isinstance(n.func, ast.Name) and allowed_builtin(n.func.id, called=True)):
+                return False
+        elif isinstance(n, (ast.Subscript, ast.Attribute)) and isinstance(n.ctx, (ast.Store, ast.Del)):
+            root = n.value
+            while isinstance(root, (ast.Subscript, ast.Attribute)):
+                root = root.value
+            if not (isinstance(root, ast.Name) and root.id in param_names):
+                return False  # could mutate module state through an alias
+        elif isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load) and n.id not in local_names:
+            if n.id in module_globals:
+                if not _is_frozen_data(module_globals[n.id]):
+                    return False
+            elif not allowed_builtin(n.id, called=False):
+                return False
+    return True
+
+_POSITIONAL_KINDS = (
+    inspect.Parameter.POSITIONAL_ONLY,
+    inspect.Parameter.POSITIONAL_OR_KEYWORD,
+    inspect.Parameter.VAR_POSITIONAL,
+)
+
+def _trivially_safe(fn: Any, node: Optional[ast.FunctionDef], params: List[inspect.Parameter]) -> bool:
+    """
+    True if no trial of 'fn' can fail, so it needs no trials at all: a plain
+    def whose body (docstring aside) is empty, 'pass', a bare constant or
+    'return <constant>', and whose parameters all take the positional
+    candidates (a keyword-only one, or a **kwargs-only signature, would fail
+    with TypeError).
+    """
+    if not _plain_def(fn, node):
+        return False
+    if any(p.kind not in _POSITIONAL_KINDS for p in params):
+        return False
+    body = node.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+        body = body[1:]  # docstring
+    if len(body) > 1:
+        return False
+    if not body:
+        return True
+    stmt = body[0]
+    if isinstance(stmt, ast.Pass):
+        return True
+    if isinstance(stmt, (ast.Return, ast.Expr)):
+        return stmt.value is None or isinstance(stmt.value, ast.Constant)
+    return False
+
+def _call_inprocess(fn: Any, args: List[Any], budget_ms: int) -> Optional[Tuple[bool, str, str]]:
+    """
+    Run one trial in this process under an ITIMER_REAL budget. Returns the
+    (ok, msg, stack) result, or None when the trial must be escalated to a
+    worker (budget exceeded, OSError, or any BaseException that is not an
+    Exception, such as KeyboardInterrupt). The caller installs
+    _raise_budget_exceeded as the SIGALRM handler, once for all its trials.
+    """
+    try:
+        try:
+            try:
+                signal.setitimer(signal.ITIMER_REAL, budget_ms / 1000.0)
+                fn(*copy.deepcopy(args))  # copies: cached candidates must stay pristine
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except OSError:
+            return None
+        except Exception as e:
+            return _failure(e)
+        return True, "", ""
+    except BaseException:
+        return None  # _BudgetExceeded, SystemExit, KeyboardInterrupt, ...
 
-    # Optional[T] or Union[T, None]
-    if origin is Union and type(None) in args:
-        inner = [a for a in args if a is not type(None)]
-        base = _values_for_annotation(inner[0]) if inner else [None]
-        return [None] + base
-
-    if ann in (int,):
-        return [0, 1, -1, 2, -2, 10**9, -10**9]
-    if ann in (float,):
-        return [0.0, -0.0, 1.0, -1.0, 1e308, -1e308, float('inf'), float('-inf'), float('nan')]
-    if ann in (bool,):
-        return [False, True]
-    if ann in (str,):
-        long = "x" * 256
-        unicodey = "ñö🦄"
-        return ["", "a", "0", "-1", long, unicodey]
-    if ann in (bytes, bytearray):
-        return [b"", b"\x00", _some_bytes_of_len(50), _some_bytes_of_len(100), _some_bytes_of_len(101)]
-    if ann in (list,):
-        return [[], [0], [1,2,3]]
-    if ann in (tuple,):
-        return [(), (0,), (1,2)]
-    if ann in (dict,):
-        return [{}, {"k":"v"}, {0:1}]
-    if ann is Any:
-        return [None, 0, 1, "", "x", b"", _some_bytes_of_len(100)]
-    # Unknown/other annotation → fall back
-    return []
-
-FALLBACKS = [
-    None,
-    0, 1, -1, 2, -2,
-    0.0, -0.0, 1.0, -1.0, float('inf'), float('-inf'), float('nan'),
-    "", "a", "0",
-    b"", _some_bytes_of_len(100), _some_bytes_of_len(101),
-    [], [0], (), (0,), {}, {"k": "v"}, True, False,
-]
 # --------------------------------------------------------------------
 # Main analyzer
 # --------------------------------------------------------------------
@@ -323,109 +1255,242 @@ def analyze_file(
     path: str,
     budget_ms: int = 200,
     max_trials_per_fn: int = 24,
-    max_findings_per_file: int = 50
+    max_findings_per_file: int = 50,
+    jobs: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Analyze top-level functions in 'path':
       - Honor file pragma '# edgecheck: ignore-file' (first 5 lines)
       - Generate small input candidates from type hints or fallbacks
-      - Execute in a subprocess with timeout
+      - Execute in worker subprocesses with timeout (up to 'jobs' functions at once;
+        None → os.cpu_count())
       - Map exceptions to EC codes (core.codes)
       - Provide AST-precise start/end columns when possible
       - Include parameter names (for smarter Quick Fixes)
     """
-    # Read source & honor ignore pragma early
-    with open(path, "r", encoding="utf-8") as f:
-        src = f.read()
-    if any(line.strip().lower() == "# edgecheck: ignore-file" for line in src.splitlines()[:5]):
+    # Honor ignore pragma early (head only: ignored files are never read in full)
+    key = _source_key(path)
+    head = _head_lines(*key)
+    if "# edgecheck: ignore-file" in head:
         return []
+    isolate_all = "# edgecheck: isolate" in head
 
-    # Parse AST (for function lines & spans)
-    tree = ast.parse(src, filename=path)
-    line_map = {n.name: n.lineno for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)}
-    fn_nodes = _function_nodes_by_name(tree)
-    fn_spans: Dict[str, List[Tuple[int,int,int,str]]] = {name: _risky_spans(fn) for name, fn in fn_nodes.items()}
+    # A spawned worker pays a full interpreter boot + module exec before its
+    # first trial: start it now so that overlaps the AST work and import below.
+    # Forked workers start almost for free and inherit the imported module, so
+    # they are only started once it exists.
+    early: Optional[WorkerSession] = None
+    if MPCTX.get_start_method() != "fork":
+        early = _checkout_sessions(key, 1)[0]
+        early.start()
+    try:
+        # Parse AST (for function lines & spans), cached per (path, mtime)
+        collector = _collect(*key)
 
-    # Load module after possible early-exit
-    mod = load_module_from_path(path)
+        # Load module after possible early-exit
+        mod = load_module_from_path(path)
 
-    findings: List[Dict[str, Any]] = []
+        # Collect only top-level functions defined in this module, in source order:
+        # names come from the module body's defs (no scan of imported attributes)
+        fns: List[Tuple[str, Any]] = []
+        for name in collector.top_level:
+            if name.startswith("_"):  # skip private helpers
+                continue
+            obj = getattr(mod, name, None)
+            if not inspect.isfunction(obj):
+                continue
+            if getattr(obj, "__module__", None) != getattr(mod, "__name__", None):
+                continue  # rebound to something imported
+            if getattr(obj, "__edgecheck_ignore__", False):
+                continue
+            fns.append((name, obj))
 
-    # Collect only top-level functions defined in this module
-    fns: List[Tuple[str, Any]] = []
-    for name, obj in inspect.getmembers(mod, inspect.isfunction):
-        if getattr(obj, "__module__", None) != getattr(mod, "__name__", None):
-            continue
-        if name.startswith("_"):  # skip private helpers
-            continue
-        if "<locals>" in getattr(obj, "__qualname__", ""):  # skip nested/local fns
-            continue
-        if getattr(obj, "__edgecheck_ignore__", False):
-            continue
-        fns.append((name, obj))
+        # The def node behind each runtime function: its line and risky spans
+        nodes = {name: collector.node_for(name, fn) for name, fn in fns}
+        line_map = {name: n.lineno for name, n in nodes.items() if n is not None}
+        fn_spans = {name: collector.spans_of(n) for name, n in nodes.items() if n is not None}
 
-    for name, fn in fns:
-        # Parameter names (used by Quick Fixes)
-        try:
-            sig = inspect.signature(fn)
-            params = list(sig.parameters.values())
+        # Per-function trial state, in function order
+        work: List[_FnTrials] = []
+        kept: List[Tuple[str, Any]] = []
+        for name, fn in fns:
+            # Parameter names (used by Quick Fixes)
+            try:
+                params = list(inspect.signature(fn).parameters.values())
+            except Exception:
+                params = []
+            if _trivially_safe(fn, nodes[name], params):
+                continue  # e.g. 'def stub(): pass': nothing to try
+            kept.append((name, fn))
             param_names = [p.name for p in params]
-        except Exception:
-            params = []
-            param_names = []
-
-        # Per-parameter candidates
-        candidates: List[List[Any]] = []
-        for p in params:
-            ann = p.annotation
-            vals = _values_for_annotation(ann) if ann is not inspect._empty else FALLBACK_VALUES
-            candidates.append(vals[:5] if vals else FALLBACK_VALUES[:5])
-
-        tried = 0
-        combos = itertools.product(*candidates) if candidates else [()]
-        for combo in combos:
-            if tried >= max_trials_per_fn:
-                break
-            if len(findings) >= max_findings_per_file:
-                break
-            tried += 1
-
-            args = list(combo)
-            ok, msg, stack = _call_with_timeout(path, name, args, {}, budget_ms)
-            if not ok:
-                # Map exception → EC code
-                exc_name = "TimeoutError" if msg.startswith("TimeoutError") else (msg.split(":")[0] if ":" in msg else "Exception")
-                ec = lookup_for_exception_name(exc_name)
-                if exc_name == "ValueError":
-                    guard_ec = lookup_valueerror_by_message(msg)
-                    if guard_ec:
-                        ec = guard_ec
-
-                # Determine the most relevant source line (prefer traceback line)
-                default_line = line_map.get(name, 1)
-                line = _extract_line_from_stack(stack, path, default_line)
-
-                # AST-precise columns
-                spans = fn_spans.get(name, [])
-                start_col, end_col = _best_span_for_exc(spans, line, exc_name)
-
-                findings.append({
-                    "file": os.path.abspath(path),
-                    "function": name,
-                    "param_names": param_names,
-                    "line": line,
-                    "start_col": start_col,
-                    "end_col": end_col,
-                    "kind": "Crash" if exc_name != "TimeoutError" else "Timeout",
-                    "code": (ec.id if ec else "EC999"),
-                    "title": (ec.title if ec else exc_name),
-                    "severity": (ec.default_severity if ec else "warning"),
-                    "message": msg,
-                    "hint": (ec.hint if ec else "Review function arguments and add guards."),
-                    "repro": {"args": args, "kwargs": {}},
-                    "stack": stack,
-                })
-                # One repro per function for now
-                break
 
-    return findings
+            # Per-parameter candidates (shared, memoized tuples)
+            candidates = [_param_candidates(p.annotation) for p in params]
+            work.append(_FnTrials(name, param_names, candidates, max_trials_per_fn))
+        fns = kept
+
+        results: List[Optional[Finding]] = [None] * len(work)
+
+        def record(i: int, args: List[Any], res: Tuple[bool, str, str]) -> bool:
+            """Store function i's finding if the trial failed; True when i is finished."""
+            ok, msg, stack = res
+            if ok:
+                return False
+            w = work[i]
+            results[i] = _make_finding(path, w.name, w.param_names, args, msg, stack, line_map, fn_spans)
+            return True
+
+        def trial_key(i: int, args: List[Any]) -> Tuple[str, int, str, int, str]:
+            return (*key, work[i].name, budget_ms, repr(args))
+
+        # Provably-safe functions run right here under a SIGALRM budget; the rest
+        # (and any function whose in-process trial escalates) go to the workers.
+        # '# edgecheck: isolate' in the file head turns the fast path off.
+        fast = _HAS_ITIMER and not isolate_all and threading.current_thread() is threading.main_thread()
+
+        def run_inline(i: int, fn: Any) -> bool:
+            """Run function i's trials in-process; False if one escalated (redo in a worker)."""
+            w = work[i]
+            while w.tried < max_trials_per_fn:
+                combo = next(w.combos, None)
+                if combo is None:
+                    break
+                w.tried += 1
+                args = list(combo)
+                tk = trial_key(i, args)
+                res = _trial_cache_get(tk)
+                if res is None:
+                    res = _call_inprocess(fn, args, budget_ms)
+                    if res is None:
+                        w.restart()
+                        return False
+                    _trial_cache_put(tk, res)
+                if record(i, args, res):
+                    break
+            return True
+
+        isolated: collections.deque = collections.deque()
+        if fast:
+            # the host's SIGALRM handler and any ITIMER_REAL it has running are
+            # put back afterwards (the timer minus the time spent here)
+            prev_timer = signal.getitimer(signal.ITIMER_REAL)
+            prev_alarm = signal.signal(signal.SIGALRM, _raise_budget_exceeded)
+            t0 = time.monotonic()
+        try:
+            for i, (name, fn) in enumerate(fns):
+                if fast and _inprocess_safe(fn, nodes[name], mod.__dict__) and run_inline(i, fn):
+                    continue
+                isolated.append(i)
+        finally:
+            if fast:
+                # None: the old handler was installed from C; the best we can do is the default
+                signal.signal(signal.SIGALRM, signal.SIG_DFL if prev_alarm is None else prev_alarm)
+                remaining, interval = prev_timer
+                if remaining > 0:
+                    remaining = max(remaining - (time.monotonic() - t0), 1e-6)
+                    signal.setitimer(signal.ITIMER_REAL, remaining, interval)
+
+        # Functions run in parallel, one worker per in-flight function; each
+        # function's trials stay sequential so "first failure wins" still holds.
+        # Under fork every worker inherits 'mod' directly.
+        n_workers = min(jobs or os.cpu_count() or 1, len(isolated))
+        sessions = [early] if early is not None and n_workers else []
+        if sessions:
+            early = None  # parked with the others below
+        sessions += _checkout_sessions(key, n_workers - len(sessions))
+        target_path = os.path.abspath(path)
+        if MPCTX.get_start_method() == "fork":
+            _PRELOADED[target_path] = mod
+
+        # conn -> (session, function, batch, deadline, index of the running trial)
+        inflight: Dict[Any, Tuple[WorkerSession, int, List[List[Any]], float, int]] = {}
+        # workers enforce each trial's budget themselves; the parent deadline
+        # (one trial's budget plus grace, from its progress frame) is the backstop
+        budget_s = budget_ms / 1000.0
+        grace_s = _WORKER_GRACE_S if _FORK_TRIALS else 0.0
+
+        def step(session: WorkerSession, i: int) -> bool:
+            """
+            Send function i's remaining uncached trials to 'session' as one batch
+            (or just the next one, if w.single); False once i is finished.
+            """
+            w = work[i]
+            batch: List[List[Any]] = []
+            while w.tried < max_trials_per_fn and w.pending is None:
+                combo = next(w.combos, None)
+                if combo is None:
+                    break
+                w.tried += 1
+                args = list(combo)
+                res = _trial_cache_get(trial_key(i, args))
+                if res is None:
+                    batch.append(args)
+                    if w.single:
+                        break
+                elif not res[0]:
+                    w.pending = (args, res)  # known failure, unless the batch before it fails first
+            if not batch:
+                if w.pending is not None:
+                    record(i, *w.pending)
+                return False
+            # a parked worker may have died idle: one retry gets a fresh one
+            if not session.submit(w.name, batch, budget_ms) and not session.submit(w.name, batch, budget_ms):
+                return settle(session, i, batch, 0, _NO_RESULT)
+            inflight[session.conn] = (session, i, batch, time.monotonic() + budget_s + grace_s, 0)
+            return True
+
+        def settle(session: WorkerSession, i: int, batch: List[List[Any]], k: int, res: Tuple[bool, str, str]) -> bool:
+            """Apply a batch reply (failure at index k, else all OK); True if more of i is in flight."""
+            ok = res[0]
+            for args in (batch if ok else batch[:k]):
+                _trial_cache_put(trial_key(i, args), _OK)
+            if ok:
+                return step(session, i)
+            _trial_cache_put(trial_key(i, batch[k]), res)
+            record(i, batch[k], res)
+            return False
+
+        def feed(session: WorkerSession) -> None:
+            """Hand 'session' the next unstarted function (functions start in order)."""
+            while isolated:
+                i = isolated[0]
+                if sum(f is not None for f in results[:i]) >= max_findings_per_file:
+                    return  # a serial sweep would have stopped before reaching i
+                isolated.popleft()
+                if step(session, i):
+                    return
+
+        try:
+            for session in sessions:
+                feed(session)
+            while inflight:
+                timeout = max(0.0, min(e[3] for e in inflight.values()) - time.monotonic())
+                for conn in _wait_conns(list(inflight), timeout):
+                    session, i, batch, _deadline, running = inflight.pop(conn)
+                    k, res = session.result()
+                    if res is None:  # trial k started: its own budget starts now
+                        inflight[conn] = (session, i, batch, time.monotonic() + budget_s + grace_s, k)
+                        continue
+                    if not settle(session, i, batch, running if k < 0 else k, res):
+                        feed(session)
+                now = time.monotonic()
+                for conn, (session, i, batch, deadline, running) in list(inflight.items()):
+                    if deadline <= now:
+                        del inflight[conn]
+                        if not settle(session, i, batch, running, session.abort()):
+                            feed(session)
+        finally:
+            # Idle sessions stay warm for the next call on this file version;
+            # any still mid-trial (we're unwinding an error) are shut down.
+            busy = [e[0] for e in inflight.values()]
+            for session in busy:
+                session.close()
+            _checkin_sessions(key, [s for s in sessions if s not in busy])
+            _PRELOADED.pop(target_path, None)
+
+        # Same findings, in the same (function) order, as a serial sweep would give
+        findings = [f for f in results if f is not None]
+        return [f.to_dict() for f in findings[:max_findings_per_file]]
+    finally:
+        if early is not None:
+            _checkin_sessions(key, [early])